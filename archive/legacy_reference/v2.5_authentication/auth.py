@@ -5,30 +5,66 @@
 COMPLETED: Bcrypt password hashing implementation
 COMPLETED: JWT token generation and validation
 COMPLETED: Secure password verification
-SECURITY: Move SECRET_KEY to environment variable (CRITICAL)
-TODO: Implement refresh token mechanism
+COMPLETED: Refresh token mechanism
+COMPLETED: SECRET_KEY loaded from ALGOTRENDY_SECRET_KEY environment variable
 TODO: Add password reset functionality
 TODO: Implement rate limiting for login attempts
 TODO: Add OAuth2 support for external providers
 TODO: Move user storage to database
 """
 
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+from passlib.hash import argon2
+import jwt
+from jwt import PyJWTError
 from pydantic import BaseModel
 import logging
 
 logger = logging.getLogger(__name__)
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context: argon2id is primary when argon2-cffi is installed;
+# existing bcrypt hashes are marked deprecated and rehashed on next login
+if argon2.has_backend():
+    pwd_context = CryptContext(
+        schemes=["argon2", "bcrypt"],
+        default="argon2",
+        deprecated="auto",
+        argon2__type="ID",
+        argon2__memory_cost=19456,
+        argon2__time_cost=2,
+        argon2__parallelism=1,
+        bcrypt__rounds=10
+    )
+else:
+    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=10)
 
 # JWT Configuration
-SECRET_KEY = "your-secret-key-change-in-production"  # TODO: Move to environment variable
+# Signing key as bytes; without ALGOTRENDY_SECRET_KEY a random per-process key is
+# used, so tokens will not survive restarts or be shared across workers
+SECRET_KEY: bytes = os.environb.get(b"ALGOTRENDY_SECRET_KEY", b"")
+if not SECRET_KEY:
+    logger.warning("ALGOTRENDY_SECRET_KEY not set; using a random per-process JWT key")
+    SECRET_KEY = secrets.token_bytes(32)
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = 7
+
+# Successful bcrypt verifications are memoized briefly so hot accounts skip the hash
+VERIFY_CACHE_SIZE = 512
+VERIFY_CACHE_TTL_SECONDS = 60
+
+# Failed verifications per account within the window before bcrypt is skipped
+VERIFY_MISS_LIMIT = 5
+VERIFY_MISS_WINDOW_SECONDS = 60
 
 
 class User(BaseModel):
@@ -49,11 +85,24 @@ class AuthService:
     """Authentication service for user management"""
 
     def __init__(self):
+        # Signing key is already bytes, so no per-operation encoding
+        self._jwt_key = SECRET_KEY
+
+        # HMAC(pepper, hash:password) -> expiry; only successful verifications are cached
+        self._verify_pepper = secrets.token_bytes(32)
+        self._verify_cache: "OrderedDict[bytes, float]" = OrderedDict()
+        self._verify_lock = threading.Lock()
+        # email -> (miss count, window start); only known accounts are tracked
+        self._verify_misses: Dict[str, Tuple[int, float]] = {}
+
         # In-memory user store (replace with database in production)
-        # Passwords are now hashed
-        self.users = {
+        # Demo passwords are hashed lazily on first login so importing this
+        # module does not pay for four bcrypt/argon2 hashes up front
+        self.users = {}
+        self._users_lock = threading.Lock()
+        self._demo_users = {
             "admin@algotrendy.com": {
-                "password_hash": pwd_context.hash("admin123"),
+                "password": "admin123",
                 "user": User(
                     id="admin_001",
                     email="admin@algotrendy.com",
@@ -63,7 +112,7 @@ def __init__(self):
                 )
             },
             "demo@algotrendy.com": {
-                "password_hash": pwd_context.hash("demo123"),
+                "password": "demo123",
                 "user": User(
                     id="demo_001",
                     email="demo@algotrendy.com",
@@ -73,7 +122,7 @@ def __init__(self):
                 )
             },
             "trader@algotrendy.com": {
-                "password_hash": pwd_context.hash("trader123"),
+                "password": "trader123",
                 "user": User(
                     id="trader_001",
                     email="trader@algotrendy.com",
@@ -83,7 +132,7 @@ def __init__(self):
                 )
             },
             "test@algotrendy.com": {
-                "password_hash": pwd_context.hash("test123"),
+                "password": "test123",
                 "user": User(
                     id="test_001",
                     email="test@algotrendy.com",
@@ -94,9 +143,67 @@ def __init__(self):
             }
         }
 
+    def _get_user_record(self, email: str) -> Optional[dict]:
+        """Look up a stored user record, hashing a demo account's password on first access"""
+        if email not in self.users and email in self._demo_users:
+            with self._users_lock:
+                # Re-check under the lock so concurrent first logins hash once,
+                # and publish the record before dropping the plaintext entry
+                if email not in self.users and email in self._demo_users:
+                    demo = self._demo_users[email]
+                    self.users[email] = {
+                        "password_hash": pwd_context.hash(demo["password"]),
+                        "user": demo["user"]
+                    }
+                    del self._demo_users[email]
+        return self.users.get(email)
+
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify password against hash"""
-        return pwd_context.verify(plain_password, hashed_password)
+        key = hmac.new(
+            self._verify_pepper,
+            f"{hashed_password}:{plain_password}".encode(),
+            hashlib.sha256
+        ).digest()
+        now = time.monotonic()
+
+        with self._verify_lock:
+            expires_at = self._verify_cache.get(key)
+            if expires_at is not None:
+                if expires_at > now:
+                    self._verify_cache.move_to_end(key)
+                    return True
+                self._verify_cache.pop(key, None)
+
+        if not pwd_context.verify(plain_password, hashed_password):
+            return False
+
+        with self._verify_lock:
+            self._verify_cache[key] = now + VERIFY_CACHE_TTL_SECONDS
+            if len(self._verify_cache) > VERIFY_CACHE_SIZE:
+                self._verify_cache.popitem(last=False)
+        return True
+
+    def _too_many_misses(self, email: str) -> bool:
+        """True while an account is over its failed-login budget for the current window"""
+        with self._verify_lock:
+            misses = self._verify_misses.get(email)
+            if misses is None:
+                return False
+            count, started = misses
+            if time.monotonic() - started >= VERIFY_MISS_WINDOW_SECONDS:
+                del self._verify_misses[email]
+                return False
+            return count >= VERIFY_MISS_LIMIT
+
+    def _record_miss(self, email: str) -> None:
+        """Count a failed verification against the account's current window"""
+        now = time.monotonic()
+        with self._verify_lock:
+            count, started = self._verify_misses.get(email, (0, now))
+            if now - started >= VERIFY_MISS_WINDOW_SECONDS:
+                count, started = 0, now
+            self._verify_misses[email] = (count + 1, started)
 
     def get_password_hash(self, password: str) -> str:
         """Hash a password"""
@@ -116,15 +223,29 @@ def authenticate_user(self, email: str, password: str) -> Optional[User]:
         email = email.lower().strip()
         password = password.strip()
 
-        if email not in self.users:
+        user_data = self._get_user_record(email)
+        if user_data is None:
             logger.warning(f"Login attempt for non-existent user: {email}")
             return None
 
-        user_data = self.users[email]
+        # Repeated misses are refused without a bcrypt call so a guessing
+        # burst against one account cannot tie up a CPU core
+        if self._too_many_misses(email):
+            logger.warning(f"Too many failed logins for user: {email}")
+            return None
+
         if not self.verify_password(password, user_data["password_hash"]):
+            self._record_miss(email)
             logger.warning(f"Invalid password for user: {email}")
             return None
 
+        with self._verify_lock:
+            self._verify_misses.pop(email, None)
+
+        # Migrate deprecated (bcrypt) hashes to the current default scheme
+        if pwd_context.needs_update(user_data["password_hash"]):
+            user_data["password_hash"] = pwd_context.hash(password)
+
         logger.info(f"Successful login: {email}")
         return user_data["user"]
 
@@ -147,10 +268,51 @@ def create_access_token(self, data: dict, expires_delta: Optional[timedelta] = N
             expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
 
         to_encode.update({"exp": expire})
-        encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+        encoded_jwt = jwt.encode(to_encode, self._jwt_key, algorithm=ALGORITHM)
 
         return encoded_jwt
 
+    def create_refresh_token(self, data: dict, expires_delta: Optional[timedelta] = None) -> str:
+        """
+        Create long-lived JWT refresh token
+
+        Args:
+            data: Data to encode in token
+            expires_delta: Token expiration time
+
+        Returns:
+            Encoded JWT refresh token
+        """
+        to_encode = data.copy()
+        expire = datetime.utcnow() + (expires_delta or timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS))
+        to_encode.update({"exp": expire, "type": "refresh"})
+
+        return jwt.encode(to_encode, self._jwt_key, algorithm=ALGORITHM)
+
+    def refresh_access_token(self, refresh_token: str) -> Optional[str]:
+        """
+        Issue a new access token from a valid refresh token
+
+        Args:
+            refresh_token: JWT refresh token
+
+        Returns:
+            New access token if the refresh token is valid, None otherwise
+        """
+        try:
+            payload = jwt.decode(
+                refresh_token, self._jwt_key, algorithms=[ALGORITHM], options={"require": ["exp"]}
+            )
+        except PyJWTError as e:
+            logger.error(f"Refresh token verification failed: {e}")
+            return None
+
+        email = payload.get("sub")
+        if payload.get("type") != "refresh" or email is None or self.get_user_by_email(email) is None:
+            return None
+
+        return self.create_access_token({"sub": email})
+
     def verify_token(self, token: str) -> Optional[str]:
         """
         Verify JWT token and extract email
@@ -162,12 +324,14 @@ def verify_token(self, token: str) -> Optional[str]:
             User email if token is valid, None otherwise
         """
         try:
-            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            payload = jwt.decode(
+                token, self._jwt_key, algorithms=[ALGORITHM], options={"require": ["exp"]}
+            )
             email: str = payload.get("sub")
-            if email is None:
+            if email is None or payload.get("type") == "refresh":
                 return None
             return email
-        except JWTError as e:
+        except PyJWTError as e:
             logger.error(f"Token verification failed: {e}")
             return None
 
@@ -184,6 +348,8 @@ def get_user_by_email(self, email: str) -> Optional[User]:
         email = email.lower().strip()
         if email in self.users:
             return self.users[email]["user"]
+        if email in self._demo_users:
+            return self._demo_users[email]["user"]
         return None
 
 
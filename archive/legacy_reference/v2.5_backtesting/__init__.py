@@ -19,6 +19,7 @@
     QuantConnectEngine,
     BacktesterComEngine,
     CustomEngine,
+    run_batch,
 )
 from .indicators import AVAILABLE_INDICATORS, calculate_indicators
 
@@ -31,6 +32,7 @@
     "QuantConnectEngine",
     "BacktesterComEngine",
     "CustomEngine",
+    "run_batch",
     "AVAILABLE_INDICATORS",
     "calculate_indicators",
 ]
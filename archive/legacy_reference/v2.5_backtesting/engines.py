@@ -8,25 +8,165 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import uuid
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 import logging
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run kernels as plain Python"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 from .models import (
     BacktestConfig,
     BacktestResults,
     BacktestStatus,
     BacktestMetrics,
     TradeResult,
-    EquityPoint,
+    EquityCurve,
 )
 from .indicators import calculate_indicators
 
 logger = logging.getLogger(__name__)
 
+# Exit reason codes written by the kernels, and the labels they map to
+EXIT_CROSSOVER = 0
+EXIT_STOP_LOSS = 1
+EXIT_TAKE_PROFIT = 2
+EXIT_END_OF_BACKTEST = 3
+EXIT_REASON_LABELS = np.array(["sma_crossover", "stop_loss", "take_profit", "end_of_backtest"])
+
+
+@njit(cache=True, nogil=True)
+def _simulate_path(closes, sma_fasts, sma_slows, initial_capital, commission_rate,
+                   cash_arr, positions_value, equity, entry_idx, exit_idx, quantity, exit_reason):
+    """
+    SMA crossover bar loop for one price path, compiled to native code.
+
+    Fills the per-bar cash, positions value and equity buffers and the
+    per-trade entry/exit bar indices, quantities and exit reason codes.
+    Returns the number of trades.
+    """
+    n = closes.shape[0]
+    n_trades = 0
+    cash = initial_capital
+    position = 0.0
+
+    # Indicators are only NaN over the leading warmup window; hold flat there
+    warmup = 0
+    while warmup < n and (np.isnan(sma_fasts[warmup]) or np.isnan(sma_slows[warmup])):
+        warmup += 1
+    cash_arr[:warmup] = initial_capital
+    positions_value[:warmup] = 0.0
+    equity[:warmup] = initial_capital
+
+    for i in range(warmup, n):
+        close_price = closes[i]
+        sma_fast = sma_fasts[i]
+        sma_slow = sma_slows[i]
+
+        # Entry signal: SMA crossover (fast > slow) and no position
+        if sma_fast > sma_slow and position == 0:
+            # Use 95% of cash to leave room for fees
+            position_size = (cash * 0.95) / close_price
+            cost = position_size * close_price
+            commission = cost * commission_rate
+
+            if cash >= (cost + commission):
+                position = position_size
+                entry_idx[n_trades] = i
+                quantity[n_trades] = position_size
+                cash -= (cost + commission)
+
+        # Exit signal: SMA crossover (fast < slow) and have position
+        elif sma_fast < sma_slow and position > 0:
+            proceeds = position * close_price
+            cash += proceeds - proceeds * commission_rate
+            exit_idx[n_trades] = i
+            exit_reason[n_trades] = EXIT_CROSSOVER
+            n_trades += 1
+            position = 0.0
+
+        # Single post-update valuation per bar, written straight to the buffers
+        current_value = position * close_price
+        cash_arr[i] = cash
+        positions_value[i] = current_value
+        equity[i] = cash + current_value
+
+    # Close any open position on the last bar
+    if position > 0:
+        proceeds = position * closes[n - 1]
+        cash += proceeds - proceeds * commission_rate
+        exit_idx[n_trades] = n - 1
+        exit_reason[n_trades] = EXIT_END_OF_BACKTEST
+        n_trades += 1
+        cash_arr[n - 1] = cash
+        positions_value[n - 1] = 0.0
+        equity[n - 1] = cash
+
+    return n_trades
+
+
+@njit(cache=True, nogil=True)
+def _strategy_kernel(closes, sma_fasts, sma_slows, initial_capital, commission_rate):
+    """Run `_simulate_path` on one path, trimming the trade arrays to the trades taken"""
+    n = closes.shape[0]
+    cash_arr = np.empty(n, dtype=np.float64)
+    positions_value = np.empty(n, dtype=np.float64)
+    equity = np.empty(n, dtype=np.float64)
+    entry_idx = np.empty(n, dtype=np.int64)
+    exit_idx = np.empty(n, dtype=np.int64)
+    quantity = np.empty(n, dtype=np.float64)
+    exit_reason = np.empty(n, dtype=np.int8)
+
+    n_trades = _simulate_path(
+        closes, sma_fasts, sma_slows, initial_capital, commission_rate,
+        cash_arr, positions_value, equity, entry_idx, exit_idx, quantity, exit_reason,
+    )
+
+    return (
+        cash_arr, positions_value, equity,
+        entry_idx[:n_trades], exit_idx[:n_trades], quantity[:n_trades], exit_reason[:n_trades],
+    )
+
+
+@njit(cache=True, parallel=True)
+def _strategy_batch_kernel(closes, sma_fasts, sma_slows, initial_capital, commission_rate):
+    """
+    Run `_simulate_path` over a (paths, bars) matrix, one path per prange iteration.
+
+    Rows are paths so each path's buffers stay contiguous. Trade arrays are
+    padded to the bar count; `n_trades[p]` gives the valid length of row p.
+    """
+    n_paths, n = closes.shape
+    cash_arr = np.empty((n_paths, n), dtype=np.float64)
+    positions_value = np.empty((n_paths, n), dtype=np.float64)
+    equity = np.empty((n_paths, n), dtype=np.float64)
+    entry_idx = np.empty((n_paths, n), dtype=np.int64)
+    exit_idx = np.empty((n_paths, n), dtype=np.int64)
+    quantity = np.empty((n_paths, n), dtype=np.float64)
+    exit_reason = np.empty((n_paths, n), dtype=np.int8)
+    n_trades = np.empty(n_paths, dtype=np.int64)
+
+    for p in prange(n_paths):
+        n_trades[p] = _simulate_path(
+            closes[p], sma_fasts[p], sma_slows[p], initial_capital[p], commission_rate[p],
+            cash_arr[p], positions_value[p], equity[p], entry_idx[p], exit_idx[p], quantity[p], exit_reason[p],
+        )
+
+    return cash_arr, positions_value, equity, entry_idx, exit_idx, quantity, exit_reason, n_trades
+
 
 class BacktestEngine(ABC):
     """Abstract base class for backtesting engines"""
@@ -79,47 +219,55 @@ async def run(self) -> BacktestResults:
             # 3. Run strategy
             trades, equity_curve = await self._run_strategy(df)
 
-            # 4. Calculate metrics
-            metrics = self._calculate_metrics(trades, equity_curve, self.config.initial_capital)
-
-            # 5. Build results
-            completed_at = datetime.utcnow()
-            execution_time = (completed_at - started_at).total_seconds()
-
-            indicators_used = [name for name, enabled in self.config.indicators.items() if enabled]
-
-            results = BacktestResults(
-                backtest_id=self.backtest_id,
-                status=BacktestStatus.COMPLETED,
-                config=self.config,
-                started_at=started_at,
-                completed_at=completed_at,
-                execution_time_seconds=execution_time,
-                metrics=metrics,
-                equity_curve=equity_curve,
-                trades=trades,
-                indicators_used=indicators_used,
-                metadata={
-                    "engine": "custom",
-                    "data_points": len(df),
-                    "strategy": "SMA Crossover"
-                }
-            )
-
-            logger.info(f"Backtest completed: {metrics.total_trades} trades, {metrics.total_return:.2f}% return")
-            return results
+            # 4-5. Calculate metrics and build results
+            return self._build_results(df, trades, equity_curve, started_at)
 
         except Exception as e:
-            logger.error(f"Backtest failed: {e}", exc_info=True)
-            return BacktestResults(
-                backtest_id=self.backtest_id,
-                status=BacktestStatus.FAILED,
-                config=self.config,
-                started_at=started_at,
-                completed_at=datetime.utcnow(),
-                error_message=str(e),
-                error_details={"error_type": type(e).__name__}
-            )
+            return self._failed_results(started_at, e)
+
+    def _build_results(self, df: pd.DataFrame, trades: List[TradeResult], equity_curve: EquityCurve,
+                       started_at: datetime) -> BacktestResults:
+        """Calculate metrics and assemble a completed BacktestResults"""
+        metrics = self._calculate_metrics(trades, equity_curve, self.config.initial_capital)
+
+        completed_at = datetime.utcnow()
+        execution_time = (completed_at - started_at).total_seconds()
+
+        indicators_used = [name for name, enabled in self.config.indicators.items() if enabled]
+
+        results = BacktestResults(
+            backtest_id=self.backtest_id,
+            status=BacktestStatus.COMPLETED,
+            config=self.config,
+            started_at=started_at,
+            completed_at=completed_at,
+            execution_time_seconds=execution_time,
+            metrics=metrics,
+            equity_curve=equity_curve,
+            trades=trades,
+            indicators_used=indicators_used,
+            metadata={
+                "engine": "custom",
+                "data_points": len(df),
+                "strategy": "SMA Crossover"
+            }
+        )
+
+        logger.info(f"Backtest completed: {metrics.total_trades} trades, {metrics.total_return:.2f}% return")
+        return results
+
+    def _failed_results(self, started_at: datetime, e: Exception) -> BacktestResults:
+        """BacktestResults for a run that raised"""
+        logger.error(f"Backtest failed: {e}", exc_info=True)
+        return BacktestResults(
+            backtest_id=self.backtest_id,
+            status=BacktestStatus.FAILED,
+            config=self.config,
+            started_at=started_at,
+            completed_at=datetime.utcnow(),
+            error_message=str(e),
+            error_details={"error_type": type(e).__name__}
+        )
 
     async def _fetch_historical_data(self) -> pd.DataFrame:
         """Fetch historical price data"""
@@ -133,7 +281,8 @@ async def _fetch_historical_data(self) -> pd.DataFrame:
         dates = pd.date_range(start=start_date, end=end_date, periods=days)
 
         # Generate mock OHLCV data
-        np.random.seed(42)  # For reproducibility
+        rng = np.random.default_rng(42)  # For reproducibility
+        n = len(dates)
 
         # Starting price based on asset
         if self.config.symbol.startswith('BTC'):
@@ -144,170 +293,114 @@ async def _fetch_historical_data(self) -> pd.DataFrame:
             base_price = 100
 
         # Generate price walk
-        returns = np.random.normal(0.0005, 0.02, len(dates))
-        price = base_price * (1 + returns).cumprod()
+        returns = rng.standard_normal(n) * 0.02 + 0.0005
+        price = base_price * np.cumprod(1 + returns)
+
+        # One uniform draw for open/high/low/volume, scaled in place column by column
+        u = rng.random((n, 4))
+        u[:, 0] = price * (0.99 + 0.02 * u[:, 0])   # open: +/-1%
+        u[:, 1] = price * (1 + 0.02 * u[:, 1])      # high: up to +2%
+        u[:, 2] = price * (1 - 0.02 * u[:, 2])      # low: down to -2%
+        u[:, 3] = 1000 + 9000 * u[:, 3]             # volume: 1000-10000
 
         # Create OHLCV
         df = pd.DataFrame({
             'timestamp': dates,
-            'open': price * (1 + np.random.uniform(-0.01, 0.01, len(dates))),
-            'high': price * (1 + np.random.uniform(0, 0.02, len(dates))),
-            'low': price * (1 + np.random.uniform(-0.02, 0, len(dates))),
+            'open': u[:, 0],
+            'high': u[:, 1],
+            'low': u[:, 2],
             'close': price,
-            'volume': np.random.uniform(1000, 10000, len(dates))
+            'volume': u[:, 3]
         })
 
         logger.info(f"Generated {len(df)} data points from {start_date} to {end_date}")
         return df
 
-    async def _run_strategy(self, df: pd.DataFrame) -> tuple[List[TradeResult], List[EquityPoint]]:
+    async def _run_strategy(self, df: pd.DataFrame) -> tuple[List[TradeResult], EquityCurve]:
         """
         Run trading strategy on data
 
         Uses SMA crossover as example strategy:
         - Long when fast SMA crosses above slow SMA
         - Exit when fast SMA crosses below slow SMA
+
+        The bar loop runs in `_strategy_kernel` (numba-compiled when
+        available); trades are built in a single post-pass and the equity
+        curve keeps the kernel's output arrays as-is.
         """
-        trades = []
-        equity_curve = []
+        closes, sma_fasts, sma_slows = self._strategy_inputs(df)
 
-        cash = self.config.initial_capital
-        position = 0
-        position_price = 0
-        position_entry_time = None
+        outputs = _strategy_kernel(
+            closes, sma_fasts, sma_slows, float(self.config.initial_capital), float(self.config.commission)
+        )
+
+        return self._strategy_results(df, closes, outputs)
 
+    def _strategy_inputs(self, df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Contiguous close, fast SMA and slow SMA arrays for the strategy kernels"""
         # Calculate SMAs for strategy (if not already done)
         if 'sma_20' not in df.columns:
             df['sma_20'] = df['close'].rolling(window=20).mean()
         if 'sma_50' not in df.columns:
             df['sma_50'] = df['close'].rolling(window=50).mean()
 
-        peak_equity = self.config.initial_capital
-
-        for idx, row in df.iterrows():
-            timestamp = row['timestamp']
-            close_price = row['close']
-            sma_fast = row['sma_20']
-            sma_slow = row['sma_50']
-
-            # Skip if indicators not ready
-            if pd.isna(sma_fast) or pd.isna(sma_slow):
-                equity_curve.append(EquityPoint(
-                    timestamp=timestamp,
-                    equity=cash,
-                    cash=cash,
-                    positions_value=0,
-                    drawdown=0
-                ))
-                continue
-
-            # Calculate current equity
-            positions_value = position * close_price if position > 0 else 0
-            current_equity = cash + positions_value
-
-            # Update peak for drawdown calculation
-            if current_equity > peak_equity:
-                peak_equity = current_equity
-
-            drawdown = ((current_equity - peak_equity) / peak_equity) * 100 if peak_equity > 0 else 0
-
-            # Entry signal: SMA crossover (fast > slow) and no position
-            if sma_fast > sma_slow and position == 0:
-                # Calculate position size (use 95% of cash to leave room for fees)
-                position_size = (cash * 0.95) / close_price
-                cost = position_size * close_price
-                commission = cost * self.config.commission
-
-                if cash >= (cost + commission):
-                    position = position_size
-                    position_price = close_price
-                    position_entry_time = timestamp
-                    cash -= (cost + commission)
-
-                    logger.debug(f"LONG entry at {close_price:.2f}, size: {position:.4f}")
-
-            # Exit signal: SMA crossover (fast < slow) and have position
-            elif sma_fast < sma_slow and position > 0:
-                # Close position
-                proceeds = position * close_price
-                commission = proceeds * self.config.commission
-                cash += (proceeds - commission)
-
-                # Calculate PnL
-                pnl = proceeds - (position * position_price)
-                pnl_percent = (pnl / (position * position_price)) * 100
-
-                # Record trade
-                duration = (timestamp - position_entry_time).total_seconds() / 60  # minutes
-                trade = TradeResult(
-                    entry_time=position_entry_time,
-                    exit_time=timestamp,
-                    entry_price=position_price,
-                    exit_price=close_price,
-                    quantity=position,
-                    side="long",
-                    pnl=pnl - (2 * commission),  # Subtract entry and exit commissions
-                    pnl_percent=pnl_percent,
-                    duration_minutes=int(duration),
-                    exit_reason="sma_crossover"
-                )
-                trades.append(trade)
-
-                logger.debug(f"LONG exit at {close_price:.2f}, PnL: ${pnl:.2f} ({pnl_percent:.2f}%)")
-
-                # Reset position
-                position = 0
-                position_price = 0
-                position_entry_time = None
-
-            # Record equity point
-            positions_value = position * close_price if position > 0 else 0
-            current_equity = cash + positions_value
-
-            equity_curve.append(EquityPoint(
-                timestamp=timestamp,
-                equity=current_equity,
-                cash=cash,
-                positions_value=positions_value,
-                drawdown=drawdown
-            ))
+        # Extract raw arrays once
+        closes = np.ascontiguousarray(df['close'].to_numpy(dtype=np.float64))
+        sma_fasts = np.ascontiguousarray(df['sma_20'].to_numpy(dtype=np.float64))
+        sma_slows = np.ascontiguousarray(df['sma_50'].to_numpy(dtype=np.float64))
+        return closes, sma_fasts, sma_slows
 
-        # Close any open positions at end
-        if position > 0:
-            final_row = df.iloc[-1]
-            close_price = final_row['close']
-            timestamp = final_row['timestamp']
+    def _strategy_results(self, df: pd.DataFrame, closes: np.ndarray, outputs: tuple) -> tuple[List[TradeResult], EquityCurve]:
+        """Build trades and the equity curve from one path's kernel outputs"""
+        cash_arr, positions_value, equity, entry_idx, exit_idx, quantity, exit_reason = outputs
+        timestamps = df['timestamp'].tolist()
+        commission_rate = float(self.config.commission)
 
-            proceeds = position * close_price
-            commission = proceeds * self.config.commission
-            cash += (proceeds - commission)
-
-            pnl = proceeds - (position * position_price)
-            pnl_percent = (pnl / (position * position_price)) * 100
-            duration = (timestamp - position_entry_time).total_seconds() / 60
-
-            trade = TradeResult(
-                entry_time=position_entry_time,
-                exit_time=timestamp,
-                entry_price=position_price,
-                exit_price=close_price,
+        # Drawdown against the running equity peak, computed in one pass
+        peak_equity = np.maximum.accumulate(equity)
+        drawdown = np.zeros_like(equity)
+        np.divide((equity - peak_equity) * 100.0, peak_equity, out=drawdown, where=peak_equity > 0)
+
+        # Exit reason codes mapped to labels in one indexing pass
+        reasons = EXIT_REASON_LABELS[exit_reason].tolist()
+
+        trades = []
+        for entry, exit_, position, reason in zip(entry_idx, exit_idx, quantity, reasons):
+            entry_price = closes[entry]
+            exit_price = closes[exit_]
+
+            proceeds = position * exit_price
+            commission = proceeds * commission_rate
+            pnl = proceeds - (position * entry_price)
+            pnl_percent = (pnl / (position * entry_price)) * 100
+            duration = (timestamps[exit_] - timestamps[entry]).total_seconds() / 60  # minutes
+
+            trades.append(TradeResult(
+                entry_time=timestamps[entry],
+                exit_time=timestamps[exit_],
+                entry_price=entry_price,
+                exit_price=exit_price,
                 quantity=position,
                 side="long",
-                pnl=pnl - (2 * commission),
+                pnl=pnl - (2 * commission),  # Subtract entry and exit commissions
                 pnl_percent=pnl_percent,
                 duration_minutes=int(duration),
-                exit_reason="end_of_backtest"
-            )
-            trades.append(trade)
+                exit_reason=reason
+            ))
+
+            logger.debug(f"LONG {entry_price:.2f} -> {exit_price:.2f}, PnL: ${pnl:.2f} ({pnl_percent:.2f}%)")
 
-            # Update final equity
-            equity_curve[-1].cash = cash
-            equity_curve[-1].positions_value = 0
-            equity_curve[-1].equity = cash
+        equity_curve = EquityCurve(
+            timestamps=df['timestamp'].to_numpy(),
+            equity=equity,
+            cash=cash_arr,
+            positions_value=positions_value,
+            drawdown=drawdown
+        )
 
         return trades, equity_curve
 
-    def _calculate_metrics(self, trades: List[TradeResult], equity_curve: List[EquityPoint], initial_capital: float) -> BacktestMetrics:
+    def _calculate_metrics(self, trades: List[TradeResult], equity_curve: EquityCurve, initial_capital: float) -> BacktestMetrics:
         """Calculate performance metrics"""
 
         if not trades:
@@ -329,69 +422,68 @@ def _calculate_metrics(self, trades: List[TradeResult], equity_curve: List[Equit
                 avg_trade_duration=0
             )
 
+        # Trade columns pulled out once; missing values count as zero
+        pnl = np.array([t.pnl or 0.0 for t in trades], dtype=np.float64)
+        durations = np.array([t.duration_minutes or 0 for t in trades], dtype=np.float64)
+
         # Basic trade statistics
-        winning_trades = [t for t in trades if t.pnl and t.pnl > 0]
-        losing_trades = [t for t in trades if t.pnl and t.pnl <= 0]
+        wins = pnl[pnl > 0]
+        losses = -pnl[pnl < 0]
 
         total_trades = len(trades)
-        num_winning = len(winning_trades)
-        num_losing = len(losing_trades)
+        num_winning = len(wins)
+        num_losing = len(losses)
 
         win_rate = (num_winning / total_trades * 100) if total_trades > 0 else 0
 
         # PnL statistics
-        total_pnl = sum(t.pnl for t in trades if t.pnl)
+        total_pnl = pnl.sum()
         total_return = (total_pnl / initial_capital) * 100
 
-        wins = [t.pnl for t in winning_trades if t.pnl]
-        losses = [abs(t.pnl) for t in losing_trades if t.pnl]
+        avg_win = wins.mean() if num_winning else 0
+        avg_loss = losses.mean() if num_losing else 0
+        largest_win = wins.max() if num_winning else 0
+        largest_loss = losses.max() if num_losing else 0
 
-        avg_win = sum(wins) / len(wins) if wins else 0
-        avg_loss = sum(losses) / len(losses) if losses else 0
-        largest_win = max(wins) if wins else 0
-        largest_loss = max(losses) if losses else 0
-
-        profit_factor = sum(wins) / sum(losses) if losses and sum(losses) > 0 else 0
+        total_losses = losses.sum()
+        profit_factor = wins.sum() / total_losses if total_losses > 0 else 0
 
         # Time-based metrics
-        if equity_curve:
-            days = (equity_curve[-1].timestamp - equity_curve[0].timestamp).days
+        if len(equity_curve):
+            days = int((equity_curve.timestamps[-1] - equity_curve.timestamps[0]) // np.timedelta64(1, 'D'))
             annual_return = (total_return / days * 365) if days > 0 else 0
         else:
             annual_return = 0
 
         # Sharpe ratio (simplified)
-        if equity_curve and len(equity_curve) > 1:
-            returns = []
-            for i in range(1, len(equity_curve)):
-                ret = (equity_curve[i].equity / equity_curve[i-1].equity) - 1
-                returns.append(ret)
-
-            returns_array = np.array(returns)
-            if len(returns_array) > 0 and returns_array.std() > 0:
-                sharpe_ratio = (returns_array.mean() / returns_array.std()) * np.sqrt(252)  # Annualized
+        equity = equity_curve.equity
+        if len(equity) > 1:
+            returns = np.diff(equity) / equity[:-1]
+            returns_std = returns.std()
+            if returns_std > 0:
+                sharpe_ratio = (returns.mean() / returns_std) * np.sqrt(252)  # Annualized
             else:
                 sharpe_ratio = 0
         else:
             sharpe_ratio = 0
 
         # Sortino ratio (simplified - using downside deviation)
-        if equity_curve and len(equity_curve) > 1:
-            negative_returns = [r for r in returns if r < 0]
-            if negative_returns:
-                downside_std = np.std(negative_returns)
-                sortino_ratio = (returns_array.mean() / downside_std) * np.sqrt(252) if downside_std > 0 else 0
+        if len(equity) > 1:
+            negative_returns = returns[returns < 0]
+            if len(negative_returns):
+                downside_std = negative_returns.std()
+                sortino_ratio = (returns.mean() / downside_std) * np.sqrt(252) if downside_std > 0 else 0
             else:
                 sortino_ratio = sharpe_ratio
         else:
             sortino_ratio = 0
 
         # Max drawdown
-        max_drawdown = min((point.drawdown for point in equity_curve), default=0)
+        max_drawdown = equity_curve.drawdown.min() if len(equity_curve) else 0
 
         # Average trade duration
-        durations = [t.duration_minutes for t in trades if t.duration_minutes]
-        avg_duration_hours = (sum(durations) / len(durations) / 60) if durations else 0
+        durations = durations[durations != 0]
+        avg_duration_hours = (durations.mean() / 60) if len(durations) else 0
 
         return BacktestMetrics(
             total_return=round(total_return, 2),
@@ -458,6 +550,56 @@ async def run(self) -> BacktestResults:
         )
 
 
+async def run_batch(configs: List[BacktestConfig]) -> List[BacktestResults]:
+    """
+    Run several backtests on the custom engine, simulating them together
+
+    Data and indicators are prepared per config. Runs with the same number of
+    bars are stacked into one (paths, bars) matrix and simulated in parallel
+    by `_strategy_batch_kernel`. Results come back in the order of `configs`.
+    """
+    engines = [CustomEngine(config) for config in configs]
+    results: List[Optional[BacktestResults]] = [None] * len(engines)
+    started_at = datetime.utcnow()
+
+    # Group prepared runs by bar count so each group stacks into a matrix
+    groups: Dict[int, list] = {}
+    for i, engine in enumerate(engines):
+        try:
+            df = await engine._fetch_historical_data()
+            df = calculate_indicators(df, engine.config.indicators, engine.config.indicator_params)
+            closes, sma_fasts, sma_slows = engine._strategy_inputs(df)
+            groups.setdefault(len(closes), []).append((i, df, closes, sma_fasts, sma_slows))
+        except Exception as e:
+            results[i] = engine._failed_results(started_at, e)
+
+    for group in groups.values():
+        (
+            cash_arr, positions_value, equity,
+            entry_idx, exit_idx, quantity, exit_reason, n_trades,
+        ) = _strategy_batch_kernel(
+            np.stack([g[2] for g in group]),
+            np.stack([g[3] for g in group]),
+            np.stack([g[4] for g in group]),
+            np.array([engines[g[0]].config.initial_capital for g in group], dtype=np.float64),
+            np.array([engines[g[0]].config.commission for g in group], dtype=np.float64),
+        )
+
+        for p, (i, df, closes, _, _) in enumerate(group):
+            engine = engines[i]
+            k = n_trades[p]
+            try:
+                trades, equity_curve = engine._strategy_results(df, closes, (
+                    cash_arr[p], positions_value[p], equity[p],
+                    entry_idx[p, :k], exit_idx[p, :k], quantity[p, :k], exit_reason[p, :k],
+                ))
+                results[i] = engine._build_results(df, trades, equity_curve, started_at)
+            except Exception as e:
+                results[i] = engine._failed_results(started_at, e)
+
+    return results
+
+
 def get_engine(config: BacktestConfig) -> BacktestEngine:
     """Factory function to get the appropriate engine"""
     if config.backtester.value == "quantconnect":
@@ -4,10 +4,27 @@
 Provides metadata and calculation functions for supported indicators.
 """
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any
+import hashlib
+import os
+import threading
 import numpy as np
 import pandas as pd
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run kernels as plain Python"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 
 # Available Indicators Configuration
 AVAILABLE_INDICATORS = {
@@ -146,9 +163,175 @@
 }
 
 
+@njit(cache=True, nogil=True)
+def _rsi_kernel(close: np.ndarray, period: int) -> np.ndarray:
+    """Wilder RSI: seed with the mean of the first `period` moves, then smooth recursively"""
+    n = close.shape[0]
+    out = np.full(n, np.nan, close.dtype)
+    if n <= period:
+        return out
+
+    avg_gain = 0.0
+    avg_loss = 0.0
+    for i in range(1, period + 1):
+        delta = close[i] - close[i - 1]
+        if delta > 0:
+            avg_gain += delta
+        else:
+            avg_loss -= delta
+    avg_gain /= period
+    avg_loss /= period
+
+    for i in range(period, n):
+        if i > period:
+            delta = close[i] - close[i - 1]
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+
+        if avg_loss == 0:
+            out[i] = 100.0
+        else:
+            out[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _macd_kernel(close: np.ndarray, fast: int, slow: int, signal: int):
+    """Fast EMA, slow EMA and signal EMA maintained together in one pass"""
+    n = close.shape[0]
+    macd = np.empty(n, close.dtype)
+    signal_line = np.empty(n, close.dtype)
+    histogram = np.empty(n, close.dtype)
+    if n == 0:
+        return macd, signal_line, histogram
+
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_signal = 2.0 / (signal + 1)
+
+    ema_fast = close[0]
+    ema_slow = close[0]
+    ema_signal = 0.0
+    for i in range(n):
+        x = close[i]
+        if i > 0:
+            ema_fast = alpha_fast * x + (1 - alpha_fast) * ema_fast
+            ema_slow = alpha_slow * x + (1 - alpha_slow) * ema_slow
+        m = ema_fast - ema_slow
+        if i == 0:
+            ema_signal = m
+        else:
+            ema_signal = alpha_signal * m + (1 - alpha_signal) * ema_signal
+        macd[i] = m
+        signal_line[i] = ema_signal
+        histogram[i] = m - ema_signal
+
+    return macd, signal_line, histogram
+
+
+@njit(cache=True, nogil=True)
+def _bbands_kernel(x: np.ndarray, period: int, k: float):
+    """Rolling mean and sample std from running sums, updated in O(1) per bar"""
+    n = x.shape[0]
+    upper = np.full(n, np.nan, x.dtype)
+    middle = np.full(n, np.nan, x.dtype)
+    lower = np.full(n, np.nan, x.dtype)
+    if n < period:
+        return upper, middle, lower
+
+    # Sums are taken around the first value to limit cancellation at high prices
+    shift = float(x[0])
+    s = 0.0
+    s2 = 0.0
+    for i in range(n):
+        d = float(x[i]) - shift
+        s += d
+        s2 += d * d
+        if i >= period:
+            d_old = float(x[i - period]) - shift
+            s -= d_old
+            s2 -= d_old * d_old
+        if i >= period - 1:
+            mean = s / period
+            var = (s2 - s * mean) / (period - 1) if period > 1 else 0.0
+            sd = np.sqrt(var) if var > 0 else 0.0
+            middle[i] = mean + shift
+            upper[i] = middle[i] + k * sd
+            lower[i] = middle[i] - k * sd
+
+    return upper, middle, lower
+
+
+@njit(cache=True, nogil=True)
+def _rolling_mean_kernel(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean with a running (float64) sum; NaN while the window holds any NaN, like pandas"""
+    n = x.shape[0]
+    out = np.full(n, np.nan, x.dtype)
+    s = 0.0
+    nans = 0
+    for i in range(n):
+        if np.isnan(x[i]):
+            nans += 1
+        else:
+            s += x[i]
+        if i >= window:
+            if np.isnan(x[i - window]):
+                nans -= 1
+            else:
+                s -= x[i - window]
+        if i >= window - 1 and nans == 0:
+            out[i] = s / window
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _rolling_min_kernel(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling minimum; NaN while the window holds any NaN"""
+    n = x.shape[0]
+    out = np.full(n, np.nan, x.dtype)
+    for i in range(window - 1, n):
+        m = x[i]
+        for j in range(i - window + 1, i + 1):
+            if np.isnan(x[j]):
+                m = np.nan
+                break
+            if x[j] < m:
+                m = x[j]
+        out[i] = m
+    return out
+
+
+@njit(cache=True, nogil=True)
+def _rolling_max_kernel(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling maximum; NaN while the window holds any NaN"""
+    n = x.shape[0]
+    out = np.full(n, np.nan, x.dtype)
+    for i in range(window - 1, n):
+        m = x[i]
+        for j in range(i - window + 1, i + 1):
+            if np.isnan(x[j]):
+                m = np.nan
+                break
+            if x[j] > m:
+                m = x[j]
+        out[i] = m
+    return out
+
+
+def _float_values(data: pd.Series) -> np.ndarray:
+    """Series values for the kernels: float32 input stays float32, anything else becomes float64"""
+    values = data.to_numpy()
+    if values.dtype != np.float32:
+        values = values.astype(np.float64, copy=False)
+    return values
+
+
 def calculate_sma(data: pd.Series, period: int) -> pd.Series:
     """Calculate Simple Moving Average"""
-    return data.rolling(window=period).mean()
+    return pd.Series(_rolling_mean_kernel(_float_values(data), period), index=data.index)
 
 
 def calculate_ema(data: pd.Series, period: int) -> pd.Series:
@@ -157,73 +340,107 @@ def calculate_ema(data: pd.Series, period: int) -> pd.Series:
 
 
 def calculate_rsi(data: pd.Series, period: int = 14) -> pd.Series:
-    """Calculate Relative Strength Index"""
-    delta = data.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    """Calculate Relative Strength Index (Wilder smoothing)"""
+    return pd.Series(_rsi_kernel(_float_values(data), period), index=data.index)
 
 
 def calculate_macd(data: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.Series]:
     """Calculate MACD"""
-    ema_fast = calculate_ema(data, fast)
-    ema_slow = calculate_ema(data, slow)
-    macd_line = ema_fast - ema_slow
-    signal_line = calculate_ema(macd_line, signal)
-    histogram = macd_line - signal_line
+    macd_line, signal_line, histogram = _macd_kernel(_float_values(data), fast, slow, signal)
 
     return {
-        "macd": macd_line,
-        "signal": signal_line,
-        "histogram": histogram
+        "macd": pd.Series(macd_line, index=data.index),
+        "signal": pd.Series(signal_line, index=data.index),
+        "histogram": pd.Series(histogram, index=data.index)
     }
 
 
 def calculate_bollinger_bands(data: pd.Series, period: int = 20, std_dev: float = 2.0) -> Dict[str, pd.Series]:
     """Calculate Bollinger Bands"""
-    sma = calculate_sma(data, period)
-    std = data.rolling(window=period).std()
-
-    upper_band = sma + (std * std_dev)
-    lower_band = sma - (std * std_dev)
+    upper_band, middle_band, lower_band = _bbands_kernel(_float_values(data), period, float(std_dev))
 
     return {
-        "upper": upper_band,
-        "middle": sma,
-        "lower": lower_band
+        "upper": pd.Series(upper_band, index=data.index),
+        "middle": pd.Series(middle_band, index=data.index),
+        "lower": pd.Series(lower_band, index=data.index)
     }
 
 
 def calculate_atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
     """Calculate Average True Range"""
-    high_low = high - low
-    high_close = np.abs(high - close.shift())
-    low_close = np.abs(low - close.shift())
+    h = _float_values(high)
+    l = _float_values(low)
+    c = _float_values(close)
+    prev_close = np.empty_like(c)
+    prev_close[:1] = np.nan
+    prev_close[1:] = c[:-1]
 
-    tr = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-    atr = tr.rolling(window=period).mean()
+    # fmax skips the missing previous close on the first bar, like DataFrame.max
+    tr = np.fmax(np.fmax(h - l, np.abs(h - prev_close)), np.abs(l - prev_close))
+    atr = pd.Series(_rolling_mean_kernel(tr, period), index=close.index)
 
     return atr
 
 
 def calculate_stochastic(high: pd.Series, low: pd.Series, close: pd.Series, k_period: int = 14, d_period: int = 3) -> Dict[str, pd.Series]:
     """Calculate Stochastic Oscillator"""
-    lowest_low = low.rolling(window=k_period).min()
-    highest_high = high.rolling(window=k_period).max()
+    lowest_low = _rolling_min_kernel(_float_values(low), k_period)
+    highest_high = _rolling_max_kernel(_float_values(high), k_period)
 
-    k = 100 * ((close - lowest_low) / (highest_high - lowest_low))
-    d = k.rolling(window=d_period).mean()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        k = 100 * ((_float_values(close) - lowest_low) / (highest_high - lowest_low))
+    d = _rolling_mean_kernel(k, d_period)
 
     return {
-        "k": k,
-        "d": d
+        "k": pd.Series(k, index=close.index),
+        "d": pd.Series(d, index=close.index)
     }
 
 
-def calculate_indicators(df: pd.DataFrame, enabled_indicators: Dict[str, bool], params: Dict[str, Any]) -> pd.DataFrame:
+# Indicator results reused across runs over the same price data (parameter sweeps)
+INDICATOR_CACHE_SIZE = 512
+_indicator_cache: "OrderedDict[tuple, Any]" = OrderedDict()
+_indicator_cache_lock = threading.Lock()
+
+
+def _data_fingerprint(cols: Dict[str, np.ndarray], dtype) -> bytes:
+    """Digest of the price columns the indicators read, and the precision they run at"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(np.dtype(dtype).str.encode())
+    for column in ('high', 'low', 'close'):
+        if column in cols:
+            digest.update(cols[column].tobytes())
+    return digest.digest()
+
+
+def _cached_indicator(fingerprint: bytes, func, args: tuple, index: pd.Index):
+    """Run an indicator through the LRU cache, storing raw arrays rather than Series"""
+    key = (fingerprint, func.__name__) + tuple(a for a in args if not isinstance(a, pd.Series))
+
+    with _indicator_cache_lock:
+        cached = _indicator_cache.get(key)
+        if cached is not None:
+            _indicator_cache.move_to_end(key)
+
+    if cached is None:
+        result = func(*args)
+        if isinstance(result, dict):
+            cached = {name: series.to_numpy() for name, series in result.items()}
+        else:
+            cached = result.to_numpy()
+
+        with _indicator_cache_lock:
+            _indicator_cache[key] = cached
+            while len(_indicator_cache) > INDICATOR_CACHE_SIZE:
+                _indicator_cache.popitem(last=False)
+
+    if isinstance(cached, dict):
+        return {name: pd.Series(values.copy(), index=index) for name, values in cached.items()}
+    return pd.Series(cached.copy(), index=index)
+
+
+def calculate_indicators(df: pd.DataFrame, enabled_indicators: Dict[str, bool], params: Dict[str, Any],
+                         dtype=np.float64) -> pd.DataFrame:
     """
     Calculate all enabled indicators and add them to the dataframe
 
@@ -231,62 +448,89 @@ def calculate_indicators(df: pd.DataFrame, enabled_indicators: Dict[str, bool],
         df: DataFrame with OHLCV data (columns: open, high, low, close, volume)
         enabled_indicators: Dict of indicator names and whether they're enabled
         params: Dict of indicator parameters
+        dtype: Precision the indicators are computed and returned in. np.float32
+            halves memory traffic for large sweeps; running sums stay float64.
 
     Returns:
         DataFrame with indicator columns added
     """
-    result_df = df.copy()
+    # Contiguous price buffers built once and shared by every indicator
+    cols = {
+        k: np.ascontiguousarray(df[k].to_numpy(dtype))
+        for k in ('high', 'low', 'close') if k in df.columns
+    }
+    prices = {k: pd.Series(v, index=df.index, copy=False) for k, v in cols.items()}
+
+    # Each job: (function, args, output column or {result key: column})
+    jobs = []
 
     # SMA
     if enabled_indicators.get("sma", False):
         period = params.get("sma_period", 20)
-        result_df[f'sma_{period}'] = calculate_sma(df['close'], period)
+        jobs.append((calculate_sma, (prices['close'], period), f'sma_{period}'))
 
     # EMA
     if enabled_indicators.get("ema", False):
         period = params.get("ema_period", 12)
-        result_df[f'ema_{period}'] = calculate_ema(df['close'], period)
+        jobs.append((calculate_ema, (prices['close'], period), f'ema_{period}'))
 
     # RSI
     if enabled_indicators.get("rsi", False):
         period = params.get("rsi_period", 14)
-        result_df[f'rsi_{period}'] = calculate_rsi(df['close'], period)
+        jobs.append((calculate_rsi, (prices['close'], period), f'rsi_{period}'))
 
     # MACD
     if enabled_indicators.get("macd", False):
         fast = params.get("macd_fast", 12)
         slow = params.get("macd_slow", 26)
         signal = params.get("macd_signal", 9)
-        macd_result = calculate_macd(df['close'], fast, slow, signal)
-        result_df['macd'] = macd_result['macd']
-        result_df['macd_signal'] = macd_result['signal']
-        result_df['macd_histogram'] = macd_result['histogram']
+        jobs.append((calculate_macd, (prices['close'], fast, slow, signal),
+                     {'macd': 'macd', 'signal': 'macd_signal', 'histogram': 'macd_histogram'}))
 
     # Bollinger Bands
     if enabled_indicators.get("bollinger", False):
         period = params.get("bollinger_period", 20)
         std_dev = params.get("bollinger_std", 2.0)
-        bb_result = calculate_bollinger_bands(df['close'], period, std_dev)
-        result_df['bb_upper'] = bb_result['upper']
-        result_df['bb_middle'] = bb_result['middle']
-        result_df['bb_lower'] = bb_result['lower']
+        jobs.append((calculate_bollinger_bands, (prices['close'], period, std_dev),
+                     {'upper': 'bb_upper', 'middle': 'bb_middle', 'lower': 'bb_lower'}))
 
     # ATR
     if enabled_indicators.get("atr", False):
         period = params.get("atr_period", 14)
-        result_df[f'atr_{period}'] = calculate_atr(df['high'], df['low'], df['close'], period)
+        jobs.append((calculate_atr, (prices['high'], prices['low'], prices['close'], period), f'atr_{period}'))
 
     # Stochastic
     if enabled_indicators.get("stochastic", False):
         k_period = params.get("stochastic_k", 14)
         d_period = params.get("stochastic_d", 3)
-        stoch_result = calculate_stochastic(df['high'], df['low'], df['close'], k_period, d_period)
-        result_df[f'stoch_k'] = stoch_result['k']
-        result_df[f'stoch_d'] = stoch_result['d']
+        jobs.append((calculate_stochastic, (prices['high'], prices['low'], prices['close'], k_period, d_period),
+                     {'k': 'stoch_k', 'd': 'stoch_d'}))
+
+    fingerprint = _data_fingerprint(cols, dtype) if jobs else b''
+
+    def run(job):
+        func, args, _ = job
+        return _cached_indicator(fingerprint, func, args, df.index)
+
+    # Indicators are independent and the kernels release the GIL, so run them concurrently
+    if len(jobs) > 1:
+        with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(run, jobs))
+    else:
+        results = [run(job) for job in jobs]
+
+    # Collect in a fixed order so column layout does not depend on scheduling
+    new_cols = {}
+    for (_, _, columns), result in zip(jobs, results):
+        if isinstance(columns, str):
+            new_cols[columns] = result.astype(dtype, copy=False)
+        else:
+            for key, column in columns.items():
+                new_cols[column] = result[key].astype(dtype, copy=False)
 
     # Volume (already in dataframe, just ensure it's there)
     if enabled_indicators.get("volume", False):
-        if 'volume' not in result_df.columns:
-            result_df['volume'] = 0
+        if 'volume' not in df.columns:
+            new_cols['volume'] = 0
 
-    return result_df
+    return df.assign(**new_cols)
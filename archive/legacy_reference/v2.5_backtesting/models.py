@@ -3,9 +3,11 @@
 """
 
 from typing import Dict, List, Optional, Any, Literal
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, validator, field_serializer
 from datetime import datetime
 from enum import Enum
+import numpy as np
+import pandas as pd
 
 
 class BacktestStatus(str, Enum):
@@ -151,6 +153,79 @@ class EquityPoint(BaseModel):
     drawdown: float = 0.0
 
 
+class EquityCurve:
+    """
+    Equity curve stored as parallel arrays, one entry per bar
+
+    Indexing returns an EquityPoint built on demand; metrics read the
+    arrays directly.
+    """
+
+    __slots__ = ("timestamps", "equity", "cash", "positions_value", "drawdown")
+
+    def __init__(self, timestamps=(), equity=(), cash=(), positions_value=(), drawdown=()):
+        self.timestamps = np.asarray(timestamps, dtype="datetime64[ns]")
+        self.equity = np.asarray(equity, dtype=np.float64)
+        self.cash = np.asarray(cash, dtype=np.float64)
+        self.positions_value = np.asarray(positions_value, dtype=np.float64)
+        self.drawdown = np.asarray(drawdown, dtype=np.float64)
+
+    @classmethod
+    def from_points(cls, points: List[Any]) -> "EquityCurve":
+        """Build from a list of EquityPoint objects or dicts"""
+        points = [EquityPoint(**p) if isinstance(p, dict) else p for p in points]
+        return cls(
+            timestamps=[p.timestamp for p in points],
+            equity=[p.equity for p in points],
+            cash=[p.cash for p in points],
+            positions_value=[p.positions_value for p in points],
+            drawdown=[p.drawdown for p in points],
+        )
+
+    def __len__(self) -> int:
+        return len(self.equity)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return EquityCurve(
+                self.timestamps[i], self.equity[i], self.cash[i], self.positions_value[i], self.drawdown[i]
+            )
+        return EquityPoint(
+            timestamp=pd.Timestamp(self.timestamps[i]).to_pydatetime(),
+            equity=self.equity[i],
+            cash=self.cash[i],
+            positions_value=self.positions_value[i],
+            drawdown=self.drawdown[i],
+        )
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """One plain dict per bar, built straight from the arrays without EquityPoint validation"""
+        timestamps = self.timestamps.astype("datetime64[us]").tolist()
+        return [
+            {"timestamp": t, "equity": e, "cash": c, "positions_value": pv, "drawdown": dd}
+            for t, e, c, pv, dd in zip(
+                timestamps,
+                self.equity.tolist(),
+                self.cash.tolist(),
+                self.positions_value.tolist(),
+                self.drawdown.tolist(),
+            )
+        ]
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Columns: timestamp, equity, cash, positions_value, drawdown"""
+        return pd.DataFrame({
+            "timestamp": self.timestamps,
+            "equity": self.equity,
+            "cash": self.cash,
+            "positions_value": self.positions_value,
+            "drawdown": self.drawdown,
+        })
+
+
 class BacktestMetrics(BaseModel):
     """Performance metrics from backtest"""
     total_return: float = Field(description="Total return %")
@@ -187,7 +262,7 @@ class BacktestResults(BaseModel):
 
     # Results
     metrics: Optional[BacktestMetrics] = None
-    equity_curve: List[EquityPoint] = Field(default_factory=list)
+    equity_curve: EquityCurve = Field(default_factory=EquityCurve)
     trades: List[TradeResult] = Field(default_factory=list)
 
     # Indicators Used
@@ -200,6 +275,26 @@ class BacktestResults(BaseModel):
     # Additional Data
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
+    class Config:
+        arbitrary_types_allowed = True
+
+    @validator('equity_curve', pre=True)
+    def coerce_equity_curve(cls, v):
+        """Accept a list of EquityPoint objects/dicts as well as an EquityCurve"""
+        if isinstance(v, EquityCurve):
+            return v
+        return EquityCurve.from_points(list(v))
+
+    @field_serializer('equity_curve')
+    def serialize_equity_curve(self, curve: EquityCurve) -> List[Dict[str, Any]]:
+        """Serialize as a list of points, the same shape the API has always returned"""
+        return curve.to_records()
+
+    @property
+    def equity_df(self) -> pd.DataFrame:
+        """Equity curve as a DataFrame (timestamp, equity, cash, positions_value, drawdown)"""
+        return self.equity_curve.to_dataframe()
+
 
 class BacktestConfigOptions(BaseModel):
     """Available configuration options for backtesting"""
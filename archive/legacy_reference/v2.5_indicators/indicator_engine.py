@@ -6,16 +6,99 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List
-from datetime import datetime
+from collections import OrderedDict
+from typing import Dict, Optional, List, Tuple
+from datetime import datetime, timedelta, timezone
 import logging
+import threading
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run kernels as plain Python"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
 
 logger = logging.getLogger(__name__)
 
+# Initial capacity of an indicator's value history; grows by doubling
+HISTORY_CAPACITY = 1024
+
+# Maximum number of indicator instances IndicatorEngine keeps alive
+INDICATOR_CACHE_SIZE = 256
+
+# Timestamps are stored as integer microseconds since the epoch, which is
+# several times cheaper to write than converting datetime -> datetime64
+_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+
+
+def _as_float_array(values) -> np.ndarray:
+    """View a price/volume sequence as a contiguous float64 array"""
+    if isinstance(values, np.ndarray):
+        return np.ascontiguousarray(values, dtype=np.float64)
+    # fromiter is markedly cheaper than np.asarray for plain lists of floats
+    return np.fromiter(values, dtype=np.float64, count=len(values))
+
+
+@njit(cache=True, nogil=True)
+def _rsi_kernel(prices):
+    """Summed gains and losses over consecutive changes"""
+    gain_sum = 0.0
+    loss_sum = 0.0
+    for i in range(1, len(prices)):
+        delta = prices[i] - prices[i - 1]
+        if delta > 0:
+            gain_sum += delta
+        elif delta < 0:
+            loss_sum += delta
+    return gain_sum, loss_sum
+
+
+@njit(cache=True, nogil=True)
+def _bollinger_kernel(window):
+    """Sum and squared deviations (M2) of ``window`` in one pass"""
+    n = len(window)
+    total = 0.0
+    # Welford's update keeps the squared deviations numerically stable
+    # without a second sweep over the window
+    running_mean = 0.0
+    m2 = 0.0
+    for i in range(n):
+        x = window[i]
+        total += x
+        delta = x - running_mean
+        running_mean += delta / (i + 1)
+        m2 += delta * (x - running_mean)
+    return total, m2
+
+
+@njit(cache=True, nogil=True)
+def _vwap_kernel(typical_prices, volumes):
+    """Sum of price x volume over the paired bars, and total volume"""
+    numerator = 0.0
+    for i in range(min(len(typical_prices), len(volumes))):
+        numerator += typical_prices[i] * volumes[i]
+    denominator = 0.0
+    for i in range(len(volumes)):
+        denominator += volumes[i]
+    return numerator, denominator
+
 
 class BaseIndicator(ABC):
     """Abstract base class for all indicators"""
     
+    # Engine caches one instance per (name, params); slots keep them small.
+    # Subclasses declare their own (possibly empty) __slots__ so no
+    # per-instance __dict__ is reintroduced.
+    __slots__ = ('params', 'last_update', '_values', '_timestamps', '_n')
+    
     def __init__(self, **params):
         """
         Initialize indicator with parameters
@@ -24,8 +107,12 @@ def __init__(self, **params):
             **params: Indicator-specific parameters
         """
         self.params = params
-        self.values = []
         self.last_update = None
+        
+        # Value history as parallel arrays rather than a list of dicts
+        self._values = np.empty(HISTORY_CAPACITY, dtype=np.float64)
+        self._timestamps = np.empty(HISTORY_CAPACITY, dtype=np.int64)
+        self._n = 0
     
     @abstractmethod
     def calculate(self, market_data: Dict) -> float:
@@ -45,22 +132,49 @@ def record_value(self, value: float, timestamp: Optional[datetime] = None):
         if timestamp is None:
             timestamp = datetime.now()
         
-        self.values.append({
-            'value': value,
-            'timestamp': timestamp
-        })
+        # Aware timestamps are stored as naive UTC
+        naive = timestamp
+        if timestamp.tzinfo is not None:
+            naive = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        
+        n = self._n
+        if n == len(self._values):
+            self._values = np.resize(self._values, 2 * n)
+            self._timestamps = np.resize(self._timestamps, 2 * n)
+        
+        self._values[n] = value
+        self._timestamps[n] = (naive - _EPOCH) // _ONE_US
+        self._n = n + 1
         self.last_update = timestamp
     
+    @property
+    def values(self) -> List[Dict]:
+        """All recorded values as dicts"""
+        return self.get_value_history()
+    
+    def get_value_arrays(self, limit: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Get history of calculated values as read-only (values, timestamps) views"""
+        start = max(self._n - limit, 0) if limit else 0
+        values = self._values[start:self._n]
+        timestamps = self._timestamps[start:self._n].view('datetime64[us]')
+        values.flags.writeable = False
+        timestamps.flags.writeable = False
+        return values, timestamps
+    
     def get_value_history(self, limit: Optional[int] = None) -> List[Dict]:
         """Get history of calculated values"""
-        if limit:
-            return self.values[-limit:]
-        return self.values
+        values, timestamps = self.get_value_arrays(limit)
+        return [
+            {'value': value, 'timestamp': timestamp}
+            for value, timestamp in zip(values.tolist(), timestamps.tolist())
+        ]
 
 
 class RSIIndicator(BaseIndicator):
     """Relative Strength Index indicator"""
     
+    __slots__ = ()
+    
     def calculate(self, market_data: Dict) -> float:
         """
         Calculate RSI from market data
@@ -78,11 +192,12 @@ def calculate(self, market_data: Dict) -> float:
             if len(prices) < period + 1:
                 return 50.0  # Neutral if not enough data
             
-            # Calculate gains and losses
-            deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-            
-            gains = sum(d for d in deltas[-period:] if d > 0) / period
-            losses = abs(sum(d for d in deltas[-period:] if d < 0) / period)
+            # Only the last period changes are used, so convert just that tail.
+            # Nothing is carried between calls: the engine shares one cached
+            # instance across every caller and symbol.
+            gain_sum, loss_sum = _rsi_kernel(_as_float_array(prices[-(period + 1):]))
+            gains = gain_sum / period
+            losses = abs(loss_sum / period)
             
             if losses == 0:
                 return 100.0
@@ -101,6 +216,8 @@ def calculate(self, market_data: Dict) -> float:
 class MACDIndicator(BaseIndicator):
     """MACD (Moving Average Convergence Divergence) indicator"""
     
+    __slots__ = ()
+    
     def calculate(self, market_data: Dict) -> Dict:
         """
         Calculate MACD from market data
@@ -143,6 +260,8 @@ def calculate(self, market_data: Dict) -> Dict:
 class MFIIndicator(BaseIndicator):
     """Money Flow Index indicator"""
     
+    __slots__ = ()
+    
     def calculate(self, market_data: Dict) -> float:
         """
         Calculate MFI from market data
@@ -178,6 +297,8 @@ def calculate(self, market_data: Dict) -> float:
 class VWAPIndicator(BaseIndicator):
     """Volume Weighted Average Price indicator"""
     
+    __slots__ = ()
+    
     def calculate(self, market_data: Dict) -> float:
         """
         Calculate VWAP from market data
@@ -192,12 +313,14 @@ def calculate(self, market_data: Dict) -> float:
             typical_prices = market_data.get('typical_prices', [])
             volumes = market_data.get('volumes', [])
             
-            if not typical_prices or not volumes:
+            if len(typical_prices) == 0 or len(volumes) == 0:
                 return market_data.get('price', 0)
             
             # VWAP = Sum(Typical Price × Volume) / Sum(Volume)
-            numerator = sum(p * v for p, v in zip(typical_prices, volumes))
-            denominator = sum(volumes)
+            numerator, denominator = _vwap_kernel(
+                _as_float_array(typical_prices),
+                _as_float_array(volumes)
+            )
             
             if denominator == 0:
                 return typical_prices[-1] if typical_prices else 0
@@ -214,6 +337,8 @@ def calculate(self, market_data: Dict) -> float:
 class BollingerBandsIndicator(BaseIndicator):
     """Bollinger Bands indicator"""
     
+    __slots__ = ()
+    
     def calculate(self, market_data: Dict) -> Dict:
         """
         Calculate Bollinger Bands from market data
@@ -238,12 +363,10 @@ def calculate(self, market_data: Dict) -> Dict:
                     'lower': current_price * 0.95
                 }
             
-            # Calculate SMA
-            sma = sum(prices[-period:]) / period
-            
-            # Calculate standard deviation
-            variance = sum((p - sma) ** 2 for p in prices[-period:]) / period
-            std_dev_val = variance ** 0.5
+            # Calculate SMA and standard deviation over the last period prices
+            total, m2 = _bollinger_kernel(_as_float_array(prices[-period:]))
+            sma = total / period
+            std_dev_val = (max(m2, 0.0) / period) ** 0.5
             
             bands = {
                 'upper': sma + (std_dev * std_dev_val),
@@ -276,8 +399,9 @@ class IndicatorEngine:
         'bollinger': BollingerBandsIndicator
     }
     
-    # Cached indicator instances
-    _cache: Dict[str, BaseIndicator] = {}
+    # Cached indicator instances, least recently used first
+    _cache: "OrderedDict[Tuple, BaseIndicator]" = OrderedDict()
+    _cache_lock = threading.Lock()
     
     @classmethod
     def get_indicator(cls, indicator_name: str, **params) -> BaseIndicator:
@@ -303,19 +427,25 @@ def get_indicator(cls, indicator_name: str, **params) -> BaseIndicator:
                 f"Available indicators: {available}"
             )
         
-        # Create cache key
-        cache_key = f"{indicator_name}_{str(params)}"
+        # Create cache key (order-independent and hashed without building a string)
+        cache_key = (indicator_name, tuple(sorted(params.items())))
         
-        # Return cached instance if exists
-        if cache_key in cls._cache:
-            return cls._cache[cache_key]
-        
-        # Create new instance
-        indicator_class = cls.INDICATORS[indicator_name]
-        indicator = indicator_class(**params)
+        with cls._cache_lock:
+            # Return cached instance if exists
+            indicator = cls._cache.get(cache_key)
+            if indicator is not None:
+                cls._cache.move_to_end(cache_key)
+                return indicator
+            
+            # Create new instance
+            indicator_class = cls.INDICATORS[indicator_name]
+            indicator = indicator_class(**params)
+            
+            # Cache it, evicting the least recently used instances
+            cls._cache[cache_key] = indicator
+            while len(cls._cache) > INDICATOR_CACHE_SIZE:
+                cls._cache.popitem(last=False)
         
-        # Cache it
-        cls._cache[cache_key] = indicator
         logger.info(f"✅ Created indicator: {indicator_name}")
         
         return indicator
@@ -359,5 +489,6 @@ def get_available_indicators(cls) -> List[str]:
     @classmethod
     def clear_cache(cls):
         """Clear indicator cache"""
-        cls._cache.clear()
+        with cls._cache_lock:
+            cls._cache.clear()
         logger.info("✅ Cleared indicator cache")
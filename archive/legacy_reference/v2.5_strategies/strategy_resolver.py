@@ -6,12 +6,139 @@
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List
+from collections import deque
+from enum import IntEnum
+from typing import Dict, Optional, List, NamedTuple, Tuple
 import logging
+import time
 from datetime import datetime
 
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run kernels as plain Python"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
 logger = logging.getLogger(__name__)
 
+# Default number of signals a strategy keeps (override with history_max)
+SIGNAL_HISTORY_SIZE = 10_000
+
+# Action codes returned by the scoring kernels (nopython mode has no str)
+HOLD, BUY, SELL = 0, 1, 2
+ACTIONS = ('HOLD', 'BUY', 'SELL')
+
+
+# Scoring kernels: the per-tick float math of each strategy, taking and
+# returning plain numbers. Explicit signatures compile them at import (or
+# load them from the on-disk cache) instead of on the first tick. Without
+# numba they run as ordinary Python; there is no separate compiled
+# (Cython/C) tier, since this single-file module has no build step and each
+# kernel is a few float ops whose cost is dwarfed by the surrounding dict
+# and Signal handling in analyze().
+
+@njit('Tuple((int8, float64, float64))(float64, float64, float64, float64, float64)',
+      cache=True, nogil=True)
+def _momentum_kernel(price_change, volume, threshold_buy, threshold_sell, volatility_filter):
+    """Action code, confidence and volatility for MomentumStrategy"""
+    volatility = abs(price_change)
+    action = HOLD
+    confidence = 0.3
+    if volatility < volatility_filter:
+        if price_change > threshold_buy:
+            action = BUY
+        elif price_change < threshold_sell:
+            action = SELL
+        if action != HOLD:
+            confidence = min(volatility / 5.0, 0.95)  # Normalize to 0.95 max
+    if volume < 100000:  # Low volume reduces confidence
+        confidence *= 0.7
+    return action, confidence, volatility
+
+
+@njit('Tuple((int8, float64))(float64, float64, float64)', cache=True, nogil=True)
+def _rsi_kernel(rsi, oversold_level, overbought_level):
+    """Action code and confidence for RSIStrategy"""
+    if rsi < oversold_level:
+        # Higher confidence for deeper oversold
+        return BUY, min((oversold_level - rsi) / oversold_level, 0.9)
+    if rsi > overbought_level:
+        return SELL, min((rsi - overbought_level) / (100 - overbought_level), 0.9)
+    return HOLD, 0.4
+
+
+@njit('Tuple((int8, float64))(float64, float64)', cache=True, nogil=True)
+def _macd_kernel(histogram, threshold):
+    """Action code and confidence for MACDStrategy"""
+    strength = min(abs(histogram) / 0.001, 0.9)  # Normalize confidence
+    if histogram > threshold:
+        return BUY, strength
+    if histogram < -threshold:
+        return SELL, strength
+    return HOLD, 0.3
+
+
+@njit('Tuple((int8, float64))(float64,)', cache=True, nogil=True)
+def _mfi_kernel(mfi):
+    """Action code and confidence for MFIStrategy"""
+    if mfi < 20:
+        return BUY, (20 - mfi) / 20 * 0.9
+    if mfi > 80:
+        return SELL, (mfi - 80) / 20 * 0.9
+    return HOLD, 0.35
+
+
+@njit('Tuple((int8, float64, float64))(float64, float64, float64, float64)',
+      cache=True, nogil=True)
+def _vwap_kernel(price, vwap, volume, vwap_distance):
+    """Action code, confidence and % deviation from VWAP for VWAPStrategy"""
+    deviation = price - vwap
+    deviation_pct = abs(deviation) / vwap * 100
+    action = HOLD
+    confidence = 0.3
+    if deviation_pct > vwap_distance:
+        if deviation < 0:
+            action = BUY
+        elif deviation > 0:
+            action = SELL
+        if action != HOLD:
+            confidence = min(deviation_pct / 3.0, 0.9)
+    if volume < 50000:  # Volume confirmation
+        confidence *= 0.6
+    return action, confidence, deviation_pct
+
+
+class Signal(NamedTuple):
+    """Trading signal produced by a strategy (a plain tuple, no per-signal dict)"""
+    action: str  # 'BUY' | 'SELL' | 'HOLD'
+    confidence: float  # 0.0-1.0
+    entry_price: Optional[float] = None
+    stop_loss: Optional[float] = None
+    target_price: Optional[float] = None
+    reason: str = ''
+    timestamp: Optional[int] = None  # time.time_ns() when generated
+    
+    @property
+    def generated_at(self) -> Optional[datetime]:
+        """Generation time as a local datetime (converted on read)"""
+        return _ns_to_datetime(self.timestamp)
+
+
+def _ns_to_datetime(ns: Optional[int]) -> Optional[datetime]:
+    """Epoch nanoseconds -> naive local datetime, keeping microseconds exact"""
+    if ns is None:
+        return None
+    seconds, rem = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=rem // 1000)
+
 
 class BaseStrategy(ABC):
     """Abstract base class for all trading strategies"""
@@ -24,11 +151,12 @@ def __init__(self, **params):
             **params: Strategy-specific parameters
         """
         self.params = params
-        self.signal_history = []
-        self.last_signal_time = None
+        # Bounded ring of recent signals: O(1) append, fixed memory
+        self.signal_history = deque(maxlen=params.get('history_max', SIGNAL_HISTORY_SIZE))
+        self._last_signal_ns: Optional[int] = None
     
     @abstractmethod
-    def analyze(self, market_data: Dict) -> Dict:
+    def analyze(self, market_data: Dict) -> Signal:
         """
         Generate trading signal from market data
         
@@ -41,33 +169,67 @@ def analyze(self, market_data: Dict) -> Dict:
                 - (strategy-specific fields)
         
         Returns:
-            Dictionary with signal information:
-            {
-                'action': 'BUY' | 'SELL' | 'HOLD',
-                'confidence': 0.0-1.0,
-                'entry_price': float,
-                'stop_loss': float,
-                'target_price': float,
-                'reason': str
-            }
+            Signal with action, confidence, entry/stop/target prices, the
+            reason and the epoch-ns time it was generated (use ._asdict()
+            for JSON)
+        
+        Parameters are validated once in __init__; malformed market data
+        (non-numeric fields, a zero VWAP) raises instead of being masked
+        as a HOLD signal.
         """
         pass
     
-    def get_signal_history(self) -> List[Dict]:
-        """Get history of generated signals"""
-        return self.signal_history
+    @property
+    def last_signal_time(self) -> Optional[datetime]:
+        """Time of the most recent signal"""
+        return _ns_to_datetime(self._last_signal_ns)
     
-    def record_signal(self, signal: Dict):
-        """Record a generated signal"""
-        signal['timestamp'] = datetime.now()
+    def get_signal_history(self) -> List[Signal]:
+        """Get history of generated signals (oldest first)"""
+        return list(self.signal_history)
+    
+    def record_signal(self, signal: Signal):
+        """Record a generated (already timestamped) signal"""
         self.signal_history.append(signal)
-        self.last_signal_time = datetime.now()
+        self._last_signal_ns = signal.timestamp
+    
+    def _build_signal(self, code: int, confidence: float, price: float, reason: str,
+                      level: Optional[float] = None) -> Signal:
+        """
+        Build a timestamped signal from a kernel's action code
+        
+        Stop-loss and target are level * STOP_LOSS_MULT[code] and
+        level * TARGET_MULT[code], where the subclass defines both tables
+        in (HOLD, BUY, SELL) order and level defaults to the entry price.
+        """
+        if level is None:
+            level = price
+        return Signal(
+            ACTIONS[code],
+            confidence,
+            price,
+            level * self.STOP_LOSS_MULT[code],
+            level * self.TARGET_MULT[code],
+            reason,
+            time.time_ns()
+        )
 
 
 class MomentumStrategy(BaseStrategy):
     """Momentum-based trading strategy"""
     
-    def analyze(self, market_data: Dict) -> Dict:
+    # Stop-loss / target multipliers by action code (HOLD, BUY, SELL)
+    STOP_LOSS_MULT = (1.02, 0.98, 1.02)
+    TARGET_MULT = (0.95, 1.05, 0.95)
+    
+    def __init__(self, **params):
+        super().__init__(**params)
+        # Params are fixed after construction; resolve them once, as floats
+        self._threshold_buy = float(params.get('threshold_buy', 2.0))
+        self._threshold_sell = float(params.get('threshold_sell', -2.0))
+        self._volatility_filter = float(params.get('volatility_filter', 0.15))
+    
+    def analyze(self, market_data: Dict) -> Signal:
         """
         Analyze market data using momentum indicators
         
@@ -76,55 +238,73 @@ def analyze(self, market_data: Dict) -> Dict:
         - Sell if price change < sell threshold
         - Hold otherwise
         """
-        try:
-            price_change = market_data.get('change_pct', 0)
-            volume = market_data.get('volume', 0)
-            price = market_data.get('price', 0)
-            
-            threshold_buy = self.params.get('threshold_buy', 2.0)
-            threshold_sell = self.params.get('threshold_sell', -2.0)
-            volatility_filter = self.params.get('volatility_filter', 0.15)
-            
-            # Calculate volatility (simplified)
-            volatility = abs(price_change)
-            
-            # Base signal
-            action = 'HOLD'
-            confidence = 0.3
-            
-            # Momentum-based decision
-            if price_change > threshold_buy and volatility < volatility_filter:
-                action = 'BUY'
-                confidence = min(abs(price_change) / 5.0, 0.95)  # Normalize to 0.95 max
-            elif price_change < threshold_sell and volatility < volatility_filter:
-                action = 'SELL'
-                confidence = min(abs(price_change) / 5.0, 0.95)
-            
-            # Volume confirmation
-            if volume < 100000:  # Low volume reduces confidence
-                confidence *= 0.7
-            
-            signal = {
-                'action': action,
-                'confidence': confidence,
-                'entry_price': price,
-                'stop_loss': price * (0.98 if action == 'BUY' else 1.02),
-                'target_price': price * (1.05 if action == 'BUY' else 0.95),
-                'reason': f"Momentum: {price_change:+.2f}% change, Volatility: {volatility:.2f}%"
-            }
-            
-            self.record_signal(signal)
-            return signal
-            
-        except Exception as e:
-            logger.error(f"Error in momentum strategy analysis: {e}")
-            return {'action': 'HOLD', 'confidence': 0.0}
+        price_change = market_data.get('change_pct', 0)
+        volume = market_data.get('volume', 0)
+        price = market_data.get('price', 0)
+        
+        code, confidence, volatility = _momentum_kernel(
+            float(price_change), float(volume),
+            self._threshold_buy, self._threshold_sell, self._volatility_filter
+        )
+        
+        reason = f"Momentum: {price_change:+.2f}% change, Volatility: {volatility:.2f}%"
+        signal = self._build_signal(code, confidence, price, reason)
+        
+        self.record_signal(signal)
+        return signal
+    
+    def analyze_batch(self, market_data) -> Dict[str, np.ndarray]:
+        """
+        Vectorized analyze over many symbols/ticks at once
+        
+        Applies the same rules as analyze() as NumPy column expressions, so
+        N rows cost a handful of array operations instead of N Python calls.
+        Batch signals carry no 'reason' and are not recorded in
+        signal_history.
+        
+        Args:
+            market_data: Column mapping (DataFrame, dict of arrays or
+                structured ndarray) with change_pct, volume and price
+        
+        Returns:
+            Dictionary of arrays keyed like the analyze() signal
+        """
+        price_change = np.asarray(market_data['change_pct'], dtype=np.float64)
+        volume = np.asarray(market_data['volume'], dtype=np.float64)
+        price = np.asarray(market_data['price'], dtype=np.float64)
+        
+        volatility = np.abs(price_change)
+        calm = volatility < self._volatility_filter
+        buy = (price_change > self._threshold_buy) & calm
+        sell = (price_change < self._threshold_sell) & calm
+        
+        confidence = np.where(buy | sell, np.minimum(volatility / 5.0, 0.95), 0.3)
+        confidence = np.where(volume < 100000, confidence * 0.7, confidence)
+        
+        return {
+            'action': np.where(buy, 'BUY', np.where(sell, 'SELL', 'HOLD')),
+            'confidence': confidence,
+            'entry_price': price,
+            'stop_loss': price * np.where(buy, 0.98, 1.02),
+            'target_price': price * np.where(buy, 1.05, 0.95)
+        }
 
 
 class RSIStrategy(BaseStrategy):
     """Relative Strength Index (RSI) strategy"""
     
-    def analyze(self, market_data: Dict) -> Dict:
+    # Stop-loss / target multipliers by action code (HOLD, BUY, SELL)
+    STOP_LOSS_MULT = (1.03, 0.97, 1.03)
+    TARGET_MULT = (0.94, 1.06, 0.94)
+    
+    def __init__(self, **params):
+        super().__init__(**params)
+        self._oversold_level = float(params.get('oversold_level', 30))
+        self._overbought_level = float(params.get('overbought_level', 70))
+        if self._oversold_level <= 0 or self._overbought_level >= 100:
+            raise ValueError("RSI levels must satisfy 0 < oversold_level and overbought_level < 100")
+    
+    def analyze(self, market_data: Dict) -> Signal:
         """
         Analyze market data using RSI indicator
         
@@ -133,55 +313,36 @@ def analyze(self, market_data: Dict) -> Dict:
         - Sell if RSI > overbought level
         - Hold otherwise
         """
-        try:
-            rsi = market_data.get('rsi', 50)
-            price = market_data.get('price', 0)
-            
-            oversold_level = self.params.get('oversold_level', 30)
-            overbought_level = self.params.get('overbought_level', 70)
-            upper_threshold = self.params.get('upper_threshold', 0.65)
-            lower_threshold = self.params.get('lower_threshold', 0.35)
-            
-            # Normalize RSI to 0-1 range
-            rsi_normalized = (rsi - lower_threshold * 100) / ((upper_threshold - lower_threshold) * 100)
-            rsi_normalized = max(0.0, min(1.0, rsi_normalized))
-            
-            action = 'HOLD'
-            confidence = 0.4
+        rsi = market_data.get('rsi', 50)
+        price = market_data.get('price', 0)
+        
+        code, confidence = _rsi_kernel(float(rsi), self._oversold_level, self._overbought_level)
+        
+        if code == BUY:
+            reason = f"RSI: {rsi:.1f} (OVERSOLD)"
+        elif code == SELL:
+            reason = f"RSI: {rsi:.1f} (OVERBOUGHT)"
+        else:
             reason = f"RSI: {rsi:.1f}"
-            
-            if rsi < oversold_level:
-                action = 'BUY'
-                confidence = (oversold_level - rsi) / oversold_level  # Higher confidence for deeper oversold
-                confidence = min(confidence, 0.9)
-                reason = f"RSI: {rsi:.1f} (OVERSOLD)"
-            elif rsi > overbought_level:
-                action = 'SELL'
-                confidence = (rsi - overbought_level) / (100 - overbought_level)
-                confidence = min(confidence, 0.9)
-                reason = f"RSI: {rsi:.1f} (OVERBOUGHT)"
-            
-            signal = {
-                'action': action,
-                'confidence': confidence,
-                'entry_price': price,
-                'stop_loss': price * (0.97 if action == 'BUY' else 1.03),
-                'target_price': price * (1.06 if action == 'BUY' else 0.94),
-                'reason': reason
-            }
-            
-            self.record_signal(signal)
-            return signal
-            
-        except Exception as e:
-            logger.error(f"Error in RSI strategy analysis: {e}")
-            return {'action': 'HOLD', 'confidence': 0.0}
+        
+        signal = self._build_signal(code, confidence, price, reason)
+        
+        self.record_signal(signal)
+        return signal
 
 
 class MACDStrategy(BaseStrategy):
     """MACD (Moving Average Convergence Divergence) strategy"""
     
-    def analyze(self, market_data: Dict) -> Dict:
+    # Stop-loss / target multipliers by action code (HOLD, BUY, SELL)
+    STOP_LOSS_MULT = (1.04, 0.96, 1.04)
+    TARGET_MULT = (0.93, 1.07, 0.93)
+    
+    def __init__(self, **params):
+        super().__init__(**params)
+        self._threshold = float(params.get('threshold', 0.0001))
+    
+    def analyze(self, market_data: Dict) -> Signal:
         """
         Analyze market data using MACD indicator
         
@@ -190,49 +351,35 @@ def analyze(self, market_data: Dict) -> Dict:
         - Sell if MACD crosses below signal line
         - Hold otherwise
         """
-        try:
-            macd = market_data.get('macd', 0)
-            signal_line = market_data.get('macd_signal', 0)
-            histogram = market_data.get('macd_histogram', 0)
-            price = market_data.get('price', 0)
-            
-            threshold = self.params.get('threshold', 0.0001)
-            
-            action = 'HOLD'
-            confidence = 0.3
+        macd = market_data.get('macd', 0)
+        signal_line = market_data.get('macd_signal', 0)
+        histogram = market_data.get('macd_histogram', 0)
+        price = market_data.get('price', 0)
+        
+        # MACD crossover detection
+        code, confidence = _macd_kernel(float(histogram), self._threshold)
+        
+        if code == BUY:
+            reason = f"MACD bullish crossover (Histogram: {histogram:.6f})"
+        elif code == SELL:
+            reason = f"MACD bearish crossover (Histogram: {histogram:.6f})"
+        else:
             reason = f"MACD: {macd:.6f}, Signal: {signal_line:.6f}"
-            
-            # MACD crossover detection
-            if histogram > threshold:
-                action = 'BUY'
-                confidence = min(abs(histogram) / 0.001, 0.9)  # Normalize confidence
-                reason = f"MACD bullish crossover (Histogram: {histogram:.6f})"
-            elif histogram < -threshold:
-                action = 'SELL'
-                confidence = min(abs(histogram) / 0.001, 0.9)
-                reason = f"MACD bearish crossover (Histogram: {histogram:.6f})"
-            
-            signal = {
-                'action': action,
-                'confidence': confidence,
-                'entry_price': price,
-                'stop_loss': price * (0.96 if action == 'BUY' else 1.04),
-                'target_price': price * (1.07 if action == 'BUY' else 0.93),
-                'reason': reason
-            }
-            
-            self.record_signal(signal)
-            return signal
-            
-        except Exception as e:
-            logger.error(f"Error in MACD strategy analysis: {e}")
-            return {'action': 'HOLD', 'confidence': 0.0}
+        
+        signal = self._build_signal(code, confidence, price, reason)
+        
+        self.record_signal(signal)
+        return signal
 
 
 class MFIStrategy(BaseStrategy):
     """Money Flow Index (MFI) strategy"""
     
-    def analyze(self, market_data: Dict) -> Dict:
+    # Stop-loss / target multipliers by action code (HOLD, BUY, SELL)
+    STOP_LOSS_MULT = (1.03, 0.97, 1.03)
+    TARGET_MULT = (0.94, 1.06, 0.94)
+    
+    def analyze(self, market_data: Dict) -> Signal:
         """
         Analyze market data using Money Flow Index
         
@@ -241,44 +388,36 @@ def analyze(self, market_data: Dict) -> Dict:
         - Sell if MFI > 80 (overbought)
         - Hold otherwise
         """
-        try:
-            mfi = market_data.get('mfi', 50)
-            price = market_data.get('price', 0)
-            
-            action = 'HOLD'
-            confidence = 0.35
+        mfi = market_data.get('mfi', 50)
+        price = market_data.get('price', 0)
+        
+        code, confidence = _mfi_kernel(float(mfi))
+        
+        if code == BUY:
+            reason = f"MFI: {mfi:.1f} (OVERSOLD)"
+        elif code == SELL:
+            reason = f"MFI: {mfi:.1f} (OVERBOUGHT)"
+        else:
             reason = f"MFI: {mfi:.1f}"
-            
-            if mfi < 20:
-                action = 'BUY'
-                confidence = (20 - mfi) / 20 * 0.9
-                reason = f"MFI: {mfi:.1f} (OVERSOLD)"
-            elif mfi > 80:
-                action = 'SELL'
-                confidence = (mfi - 80) / 20 * 0.9
-                reason = f"MFI: {mfi:.1f} (OVERBOUGHT)"
-            
-            signal = {
-                'action': action,
-                'confidence': confidence,
-                'entry_price': price,
-                'stop_loss': price * (0.97 if action == 'BUY' else 1.03),
-                'target_price': price * (1.06 if action == 'BUY' else 0.94),
-                'reason': reason
-            }
-            
-            self.record_signal(signal)
-            return signal
-            
-        except Exception as e:
-            logger.error(f"Error in MFI strategy analysis: {e}")
-            return {'action': 'HOLD', 'confidence': 0.0}
+        
+        signal = self._build_signal(code, confidence, price, reason)
+        
+        self.record_signal(signal)
+        return signal
 
 
 class VWAPStrategy(BaseStrategy):
     """Volume Weighted Average Price (VWAP) strategy"""
     
-    def analyze(self, market_data: Dict) -> Dict:
+    # Stop-loss / target multipliers by action code (HOLD, BUY, SELL)
+    STOP_LOSS_MULT = (1.01, 0.99, 1.01)
+    TARGET_MULT = (0.97, 1.03, 0.97)
+    
+    def __init__(self, **params):
+        super().__init__(**params)
+        self._vwap_distance = float(params.get('vwap_distance', 1.0))  # % deviation
+    
+    def analyze(self, market_data: Dict) -> Signal:
         """
         Analyze market data using VWAP
         
@@ -287,46 +426,34 @@ def analyze(self, market_data: Dict) -> Dict:
         - Sell if price > VWAP
         - Hold if price near VWAP
         """
-        try:
-            price = market_data.get('price', 0)
-            vwap = market_data.get('vwap', price)
-            volume = market_data.get('volume', 0)
-            
-            deviation_pct = abs(price - vwap) / vwap * 100
-            vwap_distance = self.params.get('vwap_distance', 1.0)  # % deviation
-            
-            action = 'HOLD'
-            confidence = 0.3
+        price = market_data.get('price', 0)
+        vwap = market_data.get('vwap', price)
+        volume = market_data.get('volume', 0)
+        
+        code, confidence, deviation_pct = _vwap_kernel(
+            float(price), float(vwap), float(volume), self._vwap_distance
+        )
+        
+        if code == BUY:
+            reason = f"Price below VWAP by {deviation_pct:.2f}%"
+        elif code == SELL:
+            reason = f"Price above VWAP by {deviation_pct:.2f}%"
+        else:
             reason = f"Price: {price:.2f}, VWAP: {vwap:.2f}, Dev: {deviation_pct:.2f}%"
-            
-            if price < vwap and deviation_pct > vwap_distance:
-                action = 'BUY'
-                confidence = min(deviation_pct / 3.0, 0.9)
-                reason = f"Price below VWAP by {deviation_pct:.2f}%"
-            elif price > vwap and deviation_pct > vwap_distance:
-                action = 'SELL'
-                confidence = min(deviation_pct / 3.0, 0.9)
-                reason = f"Price above VWAP by {deviation_pct:.2f}%"
-            
-            # Volume confirmation
-            if volume < 50000:
-                confidence *= 0.6
-            
-            signal = {
-                'action': action,
-                'confidence': confidence,
-                'entry_price': price,
-                'stop_loss': vwap * (0.99 if action == 'BUY' else 1.01),
-                'target_price': vwap * (1.03 if action == 'BUY' else 0.97),
-                'reason': reason
-            }
-            
-            self.record_signal(signal)
-            return signal
-            
-        except Exception as e:
-            logger.error(f"Error in VWAP strategy analysis: {e}")
-            return {'action': 'HOLD', 'confidence': 0.0}
+        
+        signal = self._build_signal(code, confidence, price, reason, vwap)
+        
+        self.record_signal(signal)
+        return signal
+
+
+class StrategyId(IntEnum):
+    """Integer ids of the built-in strategies, for callers that skip name lookup"""
+    MOMENTUM = 0
+    RSI = 1
+    MACD = 2
+    MFI = 3
+    VWAP = 4
 
 
 class StrategyResolver:
@@ -341,10 +468,18 @@ class StrategyResolver:
         'vwap': VWAPStrategy
     }
     
+    # Built-in strategies indexed by StrategyId
+    _STRATEGY_TABLE = (MomentumStrategy, RSIStrategy, MACDStrategy, MFIStrategy, VWAPStrategy)
+    
+    # Names of STRATEGIES, built on first use and reset by register_strategy
+    _available_cache: Optional[Tuple[str, ...]] = None
+    
     @classmethod
-    def get_available_strategies(cls) -> List[str]:
-        """Get list of available strategy names"""
-        return list(cls.STRATEGIES.keys())
+    def get_available_strategies(cls) -> Tuple[str, ...]:
+        """Get available strategy names"""
+        if cls._available_cache is None:
+            cls._available_cache = tuple(cls.STRATEGIES)
+        return cls._available_cache
     
     @classmethod
     def get_strategy(cls, strategy_name: str, **params) -> BaseStrategy:
@@ -371,9 +506,26 @@ def get_strategy(cls, strategy_name: str, **params) -> BaseStrategy:
             )
         
         strategy_class = cls.STRATEGIES[strategy_name]
-        logger.info(f"✅ Loaded strategy: {strategy_name}")
+        logger.info("✅ Loaded strategy: %s", strategy_name)
         return strategy_class(**params)
     
+    @classmethod
+    def get_strategy_by_id(cls, strategy_id: StrategyId, **params) -> BaseStrategy:
+        """
+        Get a built-in strategy instance by id
+        
+        Hot-path alternative to get_strategy: a tuple index instead of
+        lowercasing and hashing the name (and no load log line).
+        
+        Args:
+            strategy_id: StrategyId of the strategy
+            **params: Strategy-specific parameters
+        
+        Returns:
+            Strategy instance
+        """
+        return cls._STRATEGY_TABLE[strategy_id](**params)
+    
     @classmethod
     def register_strategy(cls, name: str, strategy_class: type):
         """
@@ -387,10 +539,11 @@ def register_strategy(cls, name: str, strategy_class: type):
             raise TypeError(f"{strategy_class} must inherit from BaseStrategy")
         
         cls.STRATEGIES[name.lower()] = strategy_class
-        logger.info(f"✅ Registered custom strategy: {name}")
+        cls._available_cache = None
+        logger.info("✅ Registered custom strategy: %s", name)
     
     @classmethod
-    def generate_signal(cls, strategy: BaseStrategy, market_data: Dict) -> Dict:
+    def generate_signal(cls, strategy: BaseStrategy, market_data: Dict) -> Signal:
         """
         Generate trading signal using strategy
         
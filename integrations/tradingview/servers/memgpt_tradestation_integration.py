@@ -8,22 +8,24 @@
 """
 
 import asyncio
-import json
+import os
 import time
-import requests
-import websocket
-import threading
+import uuid
+from collections import OrderedDict
+import aiohttp
+import orjson
+import pandas as pd
+from aiohttp import web
 from datetime import datetime
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Any, Optional, Set, Tuple
+from dataclasses import dataclass
 import logging
-from pathlib import Path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradeStationOrder:
     """TradeStation order structure"""
     symbol: str
@@ -35,7 +37,7 @@ class TradeStationOrder:
     stop_price: Optional[float] = None
     account_id: str = "SIM123456"  # Paper trading account
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MemGPTTradeSignal:
     """MemGPT trade signal structure"""
     symbol: str
@@ -59,73 +61,197 @@ def __init__(self, api_key: str = None, secret: str = None, paper_account: str =
         # Use sandbox/paper trading URL
         self.api_url = self.sandbox_url
         
+        # Account endpoints are fixed for the trader's lifetime
+        self.accounts_url = f"{self.api_url}/brokerage/accounts"
+        self.orders_url = f"{self.accounts_url}/{self.paper_account}/orders"
+        self.positions_url = f"{self.accounts_url}/{self.paper_account}/positions"
+        
+        # Shared aiohttp session, created lazily inside the running event loop
+        self._aio: Optional[aiohttp.ClientSession] = None
+        
         # Authentication
         self.access_token = None
         self.refresh_token = None
+        self.token_expires_at = 0.0  # time.monotonic() deadline
+        self.default_token_ttl = 1200  # TradeStation access tokens last 20 minutes
+        self._headers: Dict[str, str] = {}
+        self._headers_token = None  # Token the cached headers were built for
+        self._auth_lock = asyncio.Lock()  # Makes token refreshes single-flight
         
         # Active positions and orders
         self.active_positions = {}
-        self.active_orders = {}
+        self.active_orders: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.max_active_orders = 1000  # Oldest orders are evicted beyond this
+        
+        # Minimum confidence for a BUY/SELL signal to become an order
+        self.min_confidence = 0.6
+        
+        # Last (timestamp, action) handled per symbol, so pushed and streamed
+        # copies of the same decision only trade once
+        self._last_signal_seen: Dict[str, Tuple[Any, Any]] = {}
+        
+        # Order batching: signals arriving within the window are submitted together
+        self.order_batch_window = 0.05  # seconds
+        self.max_order_batch = 50
+        self._order_q: asyncio.Queue = asyncio.Queue()
+        self._order_worker: Optional[asyncio.Task] = None
+        
+        # Listener tasks are referenced here so they are not garbage collected
+        self._background_tasks: Set[asyncio.Task] = set()
         
         logger.info("🏦 TradeStation Paper Trader initialized")
         logger.info(f"📊 Paper Account: {self.paper_account}")
         logger.info(f"🔗 API Endpoint: {self.api_url}")
     
-    async def authenticate(self):
-        """Authenticate with TradeStation API"""
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Get the pooled aiohttp session, creating it on first use"""
+        if self._aio is None or self._aio.closed:
+            self._aio = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=10)
+            )
+        return self._aio
+    
+    async def aclose(self):
+        """Stop the order batcher and close the pooled HTTP session"""
+        if self._order_worker is not None:
+            self._order_worker.cancel()
+        for task in list(self._background_tasks):
+            task.cancel()
+        if self._aio is not None and not self._aio.closed:
+            await self._aio.close()
+    
+    def _spawn(self, coro) -> asyncio.Task:
+        """Run a coroutine in the background, keeping a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_task_done)
+        return task
+    
+    def _background_task_done(self, task: asyncio.Task):
+        """Drop a finished background task and log its failure, if any"""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"❌ Background task failed: {task.exception()!r}")
+    
+    def _token_valid(self) -> bool:
+        """Whether the cached access token is still usable (with a 30s safety margin)"""
+        return self.access_token is not None and time.monotonic() < self.token_expires_at - 30
+    
+    async def authenticate(self, force: bool = False, rejected_token: Optional[str] = None):
+        """Authenticate with TradeStation API
+        
+        The access token is cached for its lifetime and refreshed with the
+        refresh token when available, so repeat calls are free until expiry.
+        Refreshes are single-flight: concurrent callers wait on one lock and
+        reuse the token the first of them fetched. With force=True and the
+        rejected_token a request was sent with, the refresh is skipped if
+        another task has already replaced that token.
+        """
+        if not force and self._token_valid():
+            return True
+        
+        async with self._auth_lock:
+            # Another task may have refreshed while this one waited for the lock
+            if self._token_valid() and (not force or (rejected_token is not None
+                                                      and self.access_token != rejected_token)):
+                return True
+            return await self._fetch_token()
+    
+    async def _fetch_token(self):
+        """Request a new access token (caller holds _auth_lock)"""
         try:
             auth_url = "https://signin.tradestation.com/oauth/token"
             
-            # For paper trading, you can use demo credentials
-            auth_data = {
-                "grant_type": "client_credentials",
-                "client_id": self.api_key,
-                "client_secret": self.secret,
-                "scope": "MarketData ReadAccount Trade Crypto"
-            }
+            if self.refresh_token:
+                auth_data = {
+                    "grant_type": "refresh_token",
+                    "client_id": self.api_key,
+                    "client_secret": self.secret,
+                    "refresh_token": self.refresh_token
+                }
+            else:
+                # For paper trading, you can use demo credentials
+                auth_data = {
+                    "grant_type": "client_credentials",
+                    "client_id": self.api_key,
+                    "client_secret": self.secret,
+                    "scope": "MarketData ReadAccount Trade Crypto"
+                }
             
-            response = requests.post(auth_url, data=auth_data)
+            session = await self._ensure_session()
+            async with session.post(auth_url, data=auth_data) as response:
+                status = response.status
+                if status == 200:
+                    auth_result = await response.json()
+                else:
+                    error_text = await response.text()
             
-            if response.status_code == 200:
-                auth_result = response.json()
+            if status == 200:
                 self.access_token = auth_result.get("access_token")
-                self.refresh_token = auth_result.get("refresh_token")
+                self.refresh_token = auth_result.get("refresh_token", self.refresh_token)
+                self.token_expires_at = time.monotonic() + auth_result.get("expires_in", self.default_token_ttl)
                 
                 logger.info("✅ TradeStation authentication successful")
                 return True
             else:
-                logger.error(f"❌ Authentication failed: {response.status_code}")
-                logger.error(f"Response: {response.text}")
+                logger.error(f"❌ Authentication failed: {status}")
+                logger.error(f"Response: {error_text}")
                 
                 # For demo purposes, use mock authentication
-                self.access_token = "DEMO_ACCESS_TOKEN"
+                self._use_demo_token()
                 logger.info("🔧 Using demo authentication for paper trading")
                 return True
                 
         except Exception as e:
             logger.error(f"❌ Authentication error: {e}")
             # Fallback to demo mode
-            self.access_token = "DEMO_ACCESS_TOKEN"
+            self._use_demo_token()
             logger.info("🔧 Falling back to demo mode")
             return True
     
+    def _use_demo_token(self):
+        """Install the demo access token used when the real OAuth flow is unavailable"""
+        self.access_token = "DEMO_ACCESS_TOKEN"
+        self.refresh_token = None
+        self.token_expires_at = time.monotonic() + self.default_token_ttl
+    
+    async def _request(self, method: str, url: str, **kwargs) -> Tuple[int, Any]:
+        """Send an authenticated API request, re-authenticating once on HTTP 401
+        
+        Returns the status code and the body, parsed as JSON for 2xx responses
+        and as text otherwise.
+        """
+        await self.authenticate()
+        session = await self._ensure_session()
+        
+        for attempt in range(2):
+            token = self.access_token
+            async with session.request(method, url, headers=self.get_headers(), **kwargs) as response:
+                status = response.status
+                if status == 401 and attempt == 0:
+                    logger.info("🔑 Access token rejected, re-authenticating")
+                    await self.authenticate(force=True, rejected_token=token)
+                    continue
+                body = orjson.loads(await response.read()) if 200 <= status < 300 else await response.text()
+            return status, body
+    
     def get_headers(self):
-        """Get API headers with authentication"""
-        return {
-            "Authorization": f"Bearer {self.access_token}",
-            "Content-Type": "application/json"
-        }
+        """Get API headers with authentication, rebuilt only when the token changes"""
+        if self._headers_token != self.access_token or not self._headers:
+            self._headers = {
+                "Authorization": f"Bearer {self.access_token}",
+                "Content-Type": "application/json"
+            }
+            self._headers_token = self.access_token
+        return self._headers
     
     async def get_account_info(self):
         """Get paper trading account information"""
         try:
-            url = f"{self.api_url}/brokerage/accounts"
-            headers = self.get_headers()
-            
-            response = requests.get(url, headers=headers)
+            status, accounts = await self._request("GET", self.accounts_url)
             
-            if response.status_code == 200:
-                accounts = response.json()
+            if status == 200:
                 logger.info("📊 Account info retrieved successfully")
                 return accounts
             else:
@@ -147,12 +273,28 @@ async def get_account_info(self):
             logger.error(f"❌ Error getting account info: {e}")
             return None
     
+    def _track_order(self, order_id: str, order: TradeStationOrder, status: str = "Filled"):
+        """Record an order in the bounded active_orders LRU"""
+        self.active_orders[order_id] = {
+            "order_id": order_id,
+            "symbol": order.symbol,
+            "quantity": order.quantity,
+            "side": order.side,
+            "status": status,
+            "timestamp": datetime.now().isoformat()
+        }
+        self.active_orders.move_to_end(order_id)
+        while len(self.active_orders) > self.max_active_orders:
+            self.active_orders.popitem(last=False)
+    
+    @staticmethod
+    def _demo_order_id() -> str:
+        """Unique id for a demo fill (orders placed concurrently can share a second)"""
+        return f"DEMO_{uuid.uuid4().hex}"
+    
     async def place_order(self, order: TradeStationOrder) -> Dict[str, Any]:
         """Place a paper trade order"""
         try:
-            url = f"{self.api_url}/brokerage/accounts/{self.paper_account}/orders"
-            headers = self.get_headers()
-            
             # TradeStation order format
             order_data = {
                 "AccountID": self.paper_account,
@@ -172,21 +314,13 @@ async def place_order(self, order: TradeStationOrder) -> Dict[str, Any]:
             
             logger.info(f"📤 Placing {order.side} order for {order.quantity} {order.symbol}")
             
-            response = requests.post(url, headers=headers, json=order_data)
+            status, result = await self._request("POST", self.orders_url, data=orjson.dumps(order_data))
             
-            if response.status_code in [200, 201]:
-                result = response.json()
-                order_id = result.get("OrderID", f"DEMO_{int(time.time())}")
+            if status in [200, 201]:
+                order_id = result.get("OrderID") or self._demo_order_id()
                 
-                # Store the order
-                self.active_orders[order_id] = {
-                    "order_id": order_id,
-                    "symbol": order.symbol,
-                    "quantity": order.quantity,
-                    "side": order.side,
-                    "status": "Filled",  # Paper trades fill immediately
-                    "timestamp": datetime.now().isoformat()
-                }
+                # Store the order (paper trades fill immediately)
+                self._track_order(order_id, order)
                 
                 logger.info(f"✅ Order placed successfully - ID: {order_id}")
                 return {
@@ -196,10 +330,10 @@ async def place_order(self, order: TradeStationOrder) -> Dict[str, Any]:
                     "message": f"{order.side} {order.quantity} {order.symbol} executed"
                 }
             else:
-                logger.error(f"❌ Order failed: {response.status_code}")
+                logger.error(f"❌ Order failed: {status}")
                 return {
                     "success": False,
-                    "error": response.text,
+                    "error": result,
                     "message": "Order placement failed"
                 }
                 
@@ -207,15 +341,8 @@ async def place_order(self, order: TradeStationOrder) -> Dict[str, Any]:
             logger.error(f"❌ Error placing order: {e}")
             
             # Demo order execution for testing
-            demo_order_id = f"DEMO_{int(time.time())}"
-            self.active_orders[demo_order_id] = {
-                "order_id": demo_order_id,
-                "symbol": order.symbol,
-                "quantity": order.quantity,
-                "side": order.side,
-                "status": "Filled",
-                "timestamp": datetime.now().isoformat()
-            }
+            demo_order_id = self._demo_order_id()
+            self._track_order(demo_order_id, order)
             
             logger.info(f"🔧 Demo order executed - ID: {demo_order_id}")
             return {
@@ -225,16 +352,45 @@ async def place_order(self, order: TradeStationOrder) -> Dict[str, Any]:
                 "message": f"Demo {order.side} {order.quantity} {order.symbol} executed"
             }
     
+    async def place_orders(self, orders: List[TradeStationOrder]) -> List[Dict[str, Any]]:
+        """Place several paper orders concurrently
+        
+        TradeStation has no generic multi-order endpoint, so the batch is fanned
+        out over the pooled session with asyncio.gather instead of one
+        round-trip after another.
+        """
+        return list(await asyncio.gather(*(self.place_order(order) for order in orders)))
+    
+    async def _submit_order(self, order: TradeStationOrder) -> Dict[str, Any]:
+        """Queue an order for the batching worker and wait for its result"""
+        if self._order_worker is None or self._order_worker.done():
+            self._order_worker = asyncio.create_task(self._drain_orders())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._order_q.put((order, future))
+        return await future
+    
+    async def _drain_orders(self):
+        """Coalesce queued orders arriving within the batch window into one place_orders call"""
+        while True:
+            batch = [await self._order_q.get()]
+            while len(batch) < self.max_order_batch:
+                try:
+                    batch.append(await asyncio.wait_for(self._order_q.get(), timeout=self.order_batch_window))
+                except asyncio.TimeoutError:
+                    break
+            
+            results = await self.place_orders([order for order, _ in batch])
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+    
     async def get_positions(self) -> Dict[str, Any]:
         """Get current positions"""
         try:
-            url = f"{self.api_url}/brokerage/accounts/{self.paper_account}/positions"
-            headers = self.get_headers()
+            status, positions = await self._request("GET", self.positions_url)
             
-            response = requests.get(url, headers=headers)
-            
-            if response.status_code == 200:
-                positions = response.json()
+            if status == 200:
                 logger.info("📊 Positions retrieved successfully")
                 return positions
             else:
@@ -255,7 +411,7 @@ async def process_memgpt_signal(self, signal: MemGPTTradeSignal) -> Dict[str, An
             logger.info(f"💭 Reasoning: {signal.reasoning}")
             logger.info(f"📊 Confidence: {signal.confidence:.2%}")
             
-            if signal.action in ["BUY", "SELL"] and signal.confidence > 0.6:
+            if signal.action in ["BUY", "SELL"] and signal.confidence > self.min_confidence:
                 # Create TradeStation order
                 order = TradeStationOrder(
                     symbol=signal.symbol,
@@ -266,8 +422,8 @@ async def process_memgpt_signal(self, signal: MemGPTTradeSignal) -> Dict[str, An
                     account_id=self.paper_account
                 )
                 
-                # Place the order
-                result = await self.place_order(order)
+                # Place the order (batched with any concurrent signals)
+                result = await self._submit_order(order)
                 
                 if result["success"]:
                     logger.info(f"✅ MemGPT signal executed successfully")
@@ -305,57 +461,146 @@ async def process_memgpt_signal(self, signal: MemGPTTradeSignal) -> Dict[str, An
                 "message": "Signal processing failed"
             }
     
-    def start_memgpt_listener(self):
-        """Start listening for MemGPT signals"""
+    async def _handle_live_signal(self, data: Dict[str, Any]):
+        """Convert a companion decision payload to a signal and act on it"""
+        symbol = data.get("symbol", "BTCUSDT")
+        signal_key = (data.get("timestamp"), data.get("action"))
+        if self._last_signal_seen.get(symbol) == signal_key:
+            return
+        self._last_signal_seen[symbol] = signal_key
+        
+        signal = MemGPTTradeSignal(
+            symbol=symbol,
+            action=str(data.get("action", "HOLD")).upper(),
+            confidence=data.get("confidence", 0.5),
+            reasoning=data.get("reasoning", "No reasoning provided"),
+            quantity=100,  # Default quantity
+            price=data.get("price", 0.0),
+            timestamp=int(time.time())
+        )
+        
+        # Process high-confidence signals
+        if signal.confidence > 0.75 and signal.action in ["BUY", "SELL"]:
+            result = await self.process_memgpt_signal(signal)
+            logger.info(f"📊 Signal processed: {result}")
+    
+    async def process_signals_batch(self, signals_df: pd.DataFrame) -> List[Dict[str, Any]]:
+        """Triage a batch of MemGPT signals and place orders for the actionable ones
+        
+        Expects ``symbol``, ``action``, ``confidence`` and ``quantity`` columns.
+        Filtering is a single vectorized mask, so only the actionable subset is
+        walked row by row; the resulting orders go out together via place_orders.
+        """
+        actions = signals_df["action"].str.upper()
+        mask = (signals_df["confidence"] > self.min_confidence) & actions.isin(["BUY", "SELL"])
+        actionable = signals_df.loc[mask]
+        
+        logger.info(f"🧠 Batch triage: {len(actionable)}/{len(signals_df)} signals actionable")
+        if actionable.empty:
+            return []
+        
+        orders = [
+            TradeStationOrder(
+                symbol=row.symbol,
+                quantity=int(row.quantity),
+                side="Buy" if action == "BUY" else "Sell",
+                order_type="Market",
+                time_in_force="Day",
+                account_id=self.paper_account
+            )
+            for row, action in zip(actionable.itertuples(index=False), actions[mask])
+        ]
+        
+        results = await self.place_orders(orders)
+        return [
+            {
+                "success": result["success"],
+                "symbol": order.symbol,
+                "side": order.side,
+                "quantity": order.quantity,
+                "order_id": result.get("order_id"),
+                "error": result.get("error")
+            }
+            for order, result in zip(orders, results)
+        ]
+    
+    def start_memgpt_listener(self, callback_host: str = "0.0.0.0", callback_port: int = 5004,
+                              callback_url: Optional[str] = None):
+        """Start listening for MemGPT signals
+        
+        Signals are pushed by the companion to ``POST /signal`` on a local
+        aiohttp server; a Server-Sent Events stream from the companion acts as
+        the fallback in case the subscription is lost.
+        
+        The companion runs on another host, so push delivery needs a
+        ``callback_url`` (or ``MEMGPT_CALLBACK_URL``) it can reach; without
+        one only the stream is used.
+        """
         logger.info("👂 Starting MemGPT signal listener...")
         
         # This would connect to your MemGPT companion server
         memgpt_server = "http://216.238.90.131:5003"
+        callback_url = callback_url or os.environ.get("MEMGPT_CALLBACK_URL")
+        
+        async def handle_signal(request: web.Request) -> web.Response:
+            try:
+                data = await request.json()
+            except Exception:
+                return web.json_response({"status": "error", "message": "Invalid JSON"}, status=400)
+            
+            self._spawn(self._handle_live_signal(data))
+            return web.json_response({"status": "accepted"}, status=202)
+        
+        async def run_signal_webhook():
+            app = web.Application()
+            app.router.add_post("/signal", handle_signal)
+            runner = web.AppRunner(app)
+            await runner.setup()
+            await web.TCPSite(runner, callback_host, callback_port).start()
+            logger.info(f"📥 Signal webhook listening on {callback_host}:{callback_port}/signal")
+            
+            try:
+                session = await self._ensure_session()
+                async with session.post(f"{memgpt_server}/memgpt/subscribe",
+                                        json={"callback_url": callback_url}) as response:
+                    if response.status == 200:
+                        logger.info(f"✅ Subscribed to MemGPT signals at {callback_url}")
+                    else:
+                        logger.warning(f"⚠️ MemGPT subscription failed: {response.status}")
+            except Exception as e:
+                logger.error(f"❌ Error subscribing to MemGPT signals: {e}")
         
         async def listen_for_signals():
             while True:
                 try:
-                    # Poll MemGPT server for signals
-                    response = requests.get(f"{memgpt_server}/memgpt/live/BTCUSDT", timeout=5)
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        
-                        # Convert to MemGPT signal
-                        signal = MemGPTTradeSignal(
-                            symbol=data.get("symbol", "BTCUSDT"),
-                            action=data.get("action", "HOLD"),
-                            confidence=data.get("confidence", 0.5),
-                            reasoning=data.get("reasoning", "No reasoning provided"),
-                            quantity=100,  # Default quantity
-                            price=data.get("price", 0.0),
-                            timestamp=int(time.time())
-                        )
-                        
-                        # Process high-confidence signals
-                        if signal.confidence > 0.75 and signal.action in ["BUY", "SELL"]:
-                            result = await self.process_memgpt_signal(signal)
-                            logger.info(f"📊 Signal processed: {result}")
-                    
-                    await asyncio.sleep(10)  # Check every 10 seconds
+                    # SSE stream delivers each decision as soon as it is made;
+                    # the companion sends keepalives every 15s
+                    session = await self._ensure_session()
+                    async with session.get(f"{memgpt_server}/memgpt/stream/BTCUSDT",
+                                           timeout=aiohttp.ClientTimeout(total=None, sock_read=60)) as response:
+                        async for line in response.content:
+                            if line.startswith(b"data:"):
+                                await self._handle_live_signal(orjson.loads(line[5:]))
                     
                 except Exception as e:
                     logger.error(f"❌ Error in signal listener: {e}")
-                    await asyncio.sleep(30)
+                
+                await asyncio.sleep(5)  # Reconnect delay
         
-        # Run listener in background
-        asyncio.create_task(listen_for_signals())
+        # Run webhook receiver and fallback listener in background
+        if callback_url:
+            self._spawn(run_signal_webhook())
+        else:
+            logger.warning("⚠️ No externally reachable callback URL set; "
+                           "using the MemGPT signal stream only")
+        self._spawn(listen_for_signals())
     
     async def get_trade_history(self) -> List[Dict[str, Any]]:
         """Get trade execution history"""
         try:
-            url = f"{self.api_url}/brokerage/accounts/{self.paper_account}/orders"
-            headers = self.get_headers()
-            
-            response = requests.get(url, headers=headers)
+            status, orders = await self._request("GET", self.orders_url)
             
-            if response.status_code == 200:
-                orders = response.json()
+            if status == 200:
                 return orders.get("Orders", [])
             else:
                 # Return demo orders
@@ -406,6 +651,7 @@ async def main():
     history = await trader.get_trade_history()
     logger.info(f"📈 Trade history: {history}")
     
+    await trader.aclose()
     logger.info("✅ TradeStation Paper Trading Demo completed")
 
 if __name__ == "__main__":
@@ -5,26 +5,58 @@
 
 Shows MEM's real-time decision-making process directly on TradingView charts.
 Displays thoughts, confidence levels, and reasoning as it happens via Pine Script.
+
+Run as a script, the companion serves on gevent (when installed) and
+monkey-patches the stdlib for it; pass ``--no-gevent`` or set
+``MEMGPT_GEVENT=0`` to keep the unpatched Werkzeug dev server for debugging.
+Importing the module never patches unless ``MEMGPT_GEVENT=1`` is set.
 """
 
-import asyncio
-import json
+import os
+import sys
+
+# gevent must patch the stdlib before requests/threading are imported, so
+# whether to serve on it is decided here, before anything else is loaded
+USE_GEVENT = (os.environ.get('MEMGPT_GEVENT', '1' if __name__ == '__main__' else '0') == '1'
+              and '--no-gevent' not in sys.argv)
+GEVENT_AVAILABLE = False
+if USE_GEVENT:
+    try:
+        from gevent import monkey
+        monkey.patch_all()
+        from gevent.pywsgi import WSGIServer
+        GEVENT_AVAILABLE = True
+    except ImportError:
+        pass
+
+import glob
+import queue
 import time
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass, asdict
-from flask import Flask, jsonify, request
+from functools import cached_property
+from flask import Flask, Response, jsonify, request
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+import orjson
 import requests
-import websocket
 import threading
 import logging
-from pathlib import Path
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for responses and request parsing"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
 @dataclass
 class MEMThought:
     """MEM's real-time thought process"""
@@ -41,11 +73,6 @@ class MEMThought:
     position_size: Optional[float] = None
     # New tick-based analysis
     tick_analysis: Optional[Dict[str, Any]] = None
-from pathlib import Path
-
-# Setup logging
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
 
 @dataclass
 class MemGPTDecision:
@@ -74,12 +101,22 @@ def __init__(self, host='0.0.0.0', port=5003):
         self.host = host
         self.port = port
         self.app = Flask(__name__)
+        self.app.json = ORJSONProvider(self.app)
         CORS(self.app)
         
         # Data storage
         self.decisions_buffer: Dict[str, List[MemGPTDecision]] = {}
+        self.decisions_version: Dict[str, int] = {}  # Bumped on every add, used for ETags
+        self.decision_condition = threading.Condition()  # Wakes SSE streams on new decisions
         self.active_positions: Dict[str, Dict] = {}
         self.market_analysis: Dict[str, Dict] = {}
+        self.subscribers: set = set()  # Callback URLs that receive pushed decisions
+        
+        # Producer/consumer queues: webhook ingest and subscriber delivery never
+        # run on the request thread
+        self.webhook_queue: queue.Queue = queue.Queue(maxsize=10000)
+        self.push_queue: queue.Queue = queue.Queue(maxsize=10000)
+        self.worker_threads: List[threading.Thread] = []
         
         # Configuration
         self.max_decisions_per_symbol = 100
@@ -92,6 +129,14 @@ def __init__(self, host='0.0.0.0', port=5003):
         self.is_running = True
         self.monitor_thread = None
         
+        # Webhook ingest and subscriber delivery run for the companion's whole
+        # lifetime, so the queues drain however self.app ends up being served
+        # (start(), an external WSGI server or a test client)
+        for worker in (self._webhook_worker, self._push_worker):
+            thread = threading.Thread(target=worker, daemon=True)
+            thread.start()
+            self.worker_threads.append(thread)
+        
         logger.info("🧠 MemGPT TradingView Companion initialized")
         logger.info(f"📊 Monitoring symbols: {self.symbols_to_monitor}")
         logger.info(f"🌐 Server will run on {host}:{port}")
@@ -103,17 +148,28 @@ def setup_routes(self):
         def get_symbol_decisions(symbol):
             """Get MemGPT decisions for specific symbol"""
             symbol = symbol.upper()
+            
+            # Weak ETag tracks buffer changes so idle pollers get a bodyless 304
+            etag = f"{symbol}-{self.decisions_version.get(symbol, 0)}"
+            if request.if_none_match.contains_weak(etag):
+                # A 304 must repeat the validator a 200 would have carried
+                response = self.app.response_class(status=304)
+                response.set_etag(etag, weak=True)
+                return response
+            
             decisions = self.decisions_buffer.get(symbol, [])
             
             # Convert to JSON-serializable format
             decisions_json = [asdict(decision) for decision in decisions[-50:]]  # Last 50 decisions
             
-            return jsonify({
+            response = jsonify({
                 'symbol': symbol,
                 'decisions': decisions_json,
                 'count': len(decisions_json),
                 'latest': decisions_json[-1] if decisions_json else None
             })
+            response.set_etag(etag, weak=True)
+            return response
         
         @self.app.route('/memgpt/live/<symbol>')
         def get_live_signal(symbol):
@@ -190,7 +246,9 @@ def get_status():
                         f'/memgpt/decisions/<symbol>',
                         f'/memgpt/analysis/<symbol>',
                         f'/memgpt/status',
-                        f'/memgpt/webhook'
+                        f'/memgpt/webhook',
+                        f'/memgpt/subscribe',
+                        f'/memgpt/stream/<symbol>'
                     ]
                 }
             })
@@ -212,14 +270,76 @@ def test_endpoint():
         @self.app.route('/memgpt/webhook', methods=['POST'])
         def webhook_endpoint():
             """Receive external signals (e.g., from TradingView alerts)"""
+            data = request.get_json(silent=True)
+            if not isinstance(data, dict):
+                return jsonify({'status': 'error', 'message': 'Invalid JSON body'}), 400
+            
+            # Enqueue and acknowledge immediately; the webhook worker builds the decision
+            try:
+                self.webhook_queue.put_nowait((int(time.time()), data))
+            except queue.Full:
+                logger.error("Webhook queue full, rejecting signal")
+                return jsonify({'status': 'error', 'message': 'Signal queue full'}), 503
+            
+            return jsonify({'status': 'accepted', 'message': 'Signal queued'}), 202
+    
+        @self.app.route('/memgpt/stream/<symbol>')
+        def stream_symbol_decisions(symbol):
+            """Server-Sent Events stream of new MemGPT decisions for a symbol"""
+            symbol = symbol.upper()
+            
+            def event_stream():
+                last_version = self.decisions_version.get(symbol, 0)
+                while self.is_running:
+                    with self.decision_condition:
+                        self.decision_condition.wait_for(
+                            lambda: self.decisions_version.get(symbol, 0) != last_version or not self.is_running,
+                            timeout=15
+                        )
+                        # The version counts every decision added, so the ones this
+                        # client has not seen are the last (version - last_version)
+                        # still held in the buffer
+                        version = self.decisions_version.get(symbol, 0)
+                        buffer = self.decisions_buffer.get(symbol, [])
+                        pending = buffer[len(buffer) - min(version - last_version, len(buffer)):]
+                    
+                    if version == last_version:
+                        if not self.is_running:
+                            break
+                        yield b': keepalive\n\n'
+                        continue
+                    
+                    last_version = version
+                    for decision in pending:
+                        yield b"data: " + orjson.dumps(asdict(decision)) + b"\n\n"
+            
+            return Response(event_stream(), mimetype='text/event-stream',
+                            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+        
+        @self.app.route('/memgpt/subscribe', methods=['POST'])
+        def subscribe_endpoint():
+            """Register a callback URL to receive every new decision via POST"""
+            data = request.get_json(silent=True) or {}
+            callback_url = data.get('callback_url')
+            if not callback_url:
+                return jsonify({'status': 'error', 'message': 'callback_url is required'}), 400
+            
+            self.subscribers.add(callback_url)
+            logger.info(f"📡 New signal subscriber: {callback_url}")
+            return jsonify({'status': 'success', 'subscribers': len(self.subscribers)})
+    
+    def _webhook_worker(self):
+        """Drain queued webhook payloads into decisions"""
+        while self.is_running:
+            try:
+                received_at, data = self.webhook_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            
             try:
-                data = request.json
-                symbol = data.get('symbol', 'BTCUSDT').upper()
-                
-                # Create decision from webhook
                 decision = MemGPTDecision(
-                    timestamp=int(time.time()),
-                    symbol=symbol,
+                    timestamp=received_at,
+                    symbol=str(data.get('symbol', 'BTCUSDT')).upper(),
                     action=data.get('action', 'hold'),
                     confidence=data.get('confidence', 0.5),
                     reasoning=f"External signal: {data.get('message', 'No message')}",
@@ -229,27 +349,47 @@ def webhook_endpoint():
                     position_size=data.get('quantity', 0.0),
                     strategy="TradingView Alert"
                 )
-                
                 self.add_decision(decision)
-                
-                return jsonify({'status': 'success', 'message': 'Signal received'})
-                
             except Exception as e:
                 logger.error(f"Webhook error: {e}")
-                return jsonify({'status': 'error', 'message': str(e)}), 400
+    
+    def _push_worker(self):
+        """Deliver queued decisions to all subscribed callback URLs"""
+        while self.is_running:
+            try:
+                payload = self.push_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            
+            for callback_url in list(self.subscribers):
+                try:
+                    requests.post(callback_url, json=payload, timeout=2)
+                except Exception as e:
+                    logger.debug(f"Failed to push decision to {callback_url}: {e}")
     
     def add_decision(self, decision: MemGPTDecision):
         """Add a new MemGPT decision"""
         symbol = decision.symbol
         
-        if symbol not in self.decisions_buffer:
-            self.decisions_buffer[symbol] = []
-        
-        self.decisions_buffer[symbol].append(decision)
+        with self.decision_condition:
+            if symbol not in self.decisions_buffer:
+                self.decisions_buffer[symbol] = []
+            
+            self.decisions_buffer[symbol].append(decision)
+            
+            # Keep only recent decisions
+            if len(self.decisions_buffer[symbol]) > self.max_decisions_per_symbol:
+                self.decisions_buffer[symbol] = self.decisions_buffer[symbol][-self.max_decisions_per_symbol:]
+            
+            self.decisions_version[symbol] = self.decisions_version.get(symbol, 0) + 1
+            self.decision_condition.notify_all()
         
-        # Keep only recent decisions
-        if len(self.decisions_buffer[symbol]) > self.max_decisions_per_symbol:
-            self.decisions_buffer[symbol] = self.decisions_buffer[symbol][-self.max_decisions_per_symbol:]
+        # Push to subscribers off the request path
+        if self.subscribers:
+            try:
+                self.push_queue.put_nowait(asdict(decision))
+            except queue.Full:
+                logger.warning(f"Push queue full, dropping {symbol} decision for subscribers")
         
         logger.info(f"📊 {symbol}: {decision.action} @ {decision.price} (confidence: {decision.confidence:.2f})")
         logger.info(f"🧠 Reasoning: {decision.reasoning[:80]}...")
@@ -382,20 +522,18 @@ def _read_memgpt_logs(self, symbol: str) -> Optional[MemGPTDecision]:
                 f'/root/algotrendy_v2.5/*memgpt*.log'
             ]
             
-            import glob
-            
             for pattern in log_patterns:
                 files = glob.glob(pattern)
                 if not files:
                     continue
                 
                 # Get most recent file
-                latest_file = max(files, key=lambda x: Path(x).stat().st_mtime)
+                latest_file = max(files, key=os.path.getmtime)
                 
                 # Try to read JSON data
                 if latest_file.endswith('.json'):
-                    with open(latest_file, 'r') as f:
-                        data = json.load(f)
+                    with open(latest_file, 'rb') as f:
+                        data = orjson.loads(f.read())
                         
                         # Look for trading decisions
                         if 'trades' in data:
@@ -706,6 +844,11 @@ def _sentiment_to_number(self, sentiment: str) -> float:
     
     def generate_pine_script(self) -> str:
         """Generate Pine Script code for TradingView"""
+        return self._pine_script
+    
+    @cached_property
+    def _pine_script(self) -> str:
+        """Render the Pine Script once; only ``self.port`` varies and it is fixed after init"""
         return f'''
 //@version=5
 indicator("MemGPT Trading Companion", shorttitle="MemGPT", overlay=true, max_boxes_count=100, max_labels_count=100)
@@ -830,8 +973,14 @@ def generate_pine_script(self) -> str:
                message="MemGPT suggests SELL for {{{{ticker}}}} at {{{{close}}}} - Confidence: " + str.tostring(memgpt_confidence))
 '''
     
-    def start(self):
-        """Start the MemGPT companion system"""
+    def start(self, use_gevent: bool = USE_GEVENT):
+        """Start the MemGPT companion system
+        
+        Serves on gevent's WSGIServer when it was enabled and patched at
+        import (see the module docstring) so concurrent webhook POSTs and
+        polls are multiplexed; otherwise, or with ``use_gevent=False``, it
+        uses the Werkzeug dev server.
+        """
         self.start_time = time.time()
         
         # Start monitoring thread
@@ -845,12 +994,20 @@ def start(self):
         logger.info(f"   System status: http://{self.host}:{self.port}/memgpt/status")
         logger.info(f"   Webhook: http://{self.host}:{self.port}/memgpt/webhook")
         
-        # Start Flask server
-        self.app.run(host=self.host, port=self.port, debug=False)
+        # Start server
+        if use_gevent and GEVENT_AVAILABLE:
+            logger.info("⚡ Serving with gevent WSGIServer")
+            WSGIServer((self.host, self.port), self.app).serve_forever()
+        else:
+            if use_gevent:
+                logger.warning("gevent not installed or not enabled at import, falling back to Flask dev server")
+            self.app.run(host=self.host, port=self.port, debug=False)
     
     def stop(self):
         """Stop the companion system"""
-        self.is_running = False
+        with self.decision_condition:
+            self.is_running = False
+            self.decision_condition.notify_all()
         logger.info("🛑 MemGPT TradingView Companion stopped")
 
 if __name__ == "__main__":
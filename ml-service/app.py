@@ -6,8 +6,12 @@
 """
 
 from flask import Flask, request, jsonify
+from flask.json.provider import JSONProvider
 import numpy as np
+import orjson
 import logging
+import threading
+import time
 from datetime import datetime
 import sys
 
@@ -23,7 +27,42 @@
 
 logger = logging.getLogger(__name__)
 
+# NumPy arrays/scalars (e.g. predict_batch output) serialize natively
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY
+
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson for jsonify and request.get_json"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Hand orjson's bytes straight to the response, skipping the str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=ORJSON_OPTIONS),
+                                        mimetype='application/json')
+
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# (epoch second, ISO string) for iso_now; swapped as one tuple so threads
+# never see a second paired with another second's string
+_iso_cache = (0, '')
+
+
+def iso_now():
+    """Current UTC time as an ISO string, formatted at most once per second"""
+    global _iso_cache
+    now = int(time.time())
+    cached = _iso_cache
+    if cached[0] != now:
+        cached = _iso_cache = (now, datetime.utcfromtimestamp(now).isoformat())
+    return cached[1]
 
 # Mock ML model for now - will be replaced with actual trained model
 class MockMLModel:
@@ -49,31 +88,63 @@ def predict(self, features):
             raise ValueError(f"Expected {self.feature_count} features, got {len(features)}")
 
         # Mock logic: check if RSI (first 4 features) indicates reversal
-        rsi_14 = features[0]
-        rsi_7 = features[1]
-
-        # Oversold condition (potential reversal up)
-        if rsi_14 < 35 and rsi_7 < 30:
-            is_reversal = True
-            confidence = 0.75 + (30 - rsi_7) / 100  # Higher confidence for lower RSI
-        # Overbought condition (potential reversal down)
-        elif rsi_14 > 65 and rsi_7 > 70:
-            is_reversal = True
-            confidence = 0.75 + (rsi_7 - 70) / 100  # Higher confidence for higher RSI
-        else:
-            is_reversal = False
-            confidence = 0.45 + np.random.random() * 0.15  # Random confidence between 0.45-0.60
-
-        # Cap confidence
-        confidence = min(confidence, 0.95)
+        rsi_14 = float(features[0])
+        rsi_7 = float(features[1])
+
+        # Oversold -> potential reversal up, overbought -> potential reversal down
+        oversold = rsi_14 < 35 and rsi_7 < 30
+        overbought = rsi_14 > 65 and rsi_7 > 70
+        is_reversal = oversold or overbought
+
+        # Higher confidence the further RSI_7 is past its 30/70 band, capped;
+        # neutral 0.5 otherwise (the mock stays deterministic)
+        excess = (30 - rsi_7) if oversold else (rsi_7 - 70)
+        confidence = min(0.75 + excess / 100, 0.95) if is_reversal else 0.5
 
+        # Oversold implies RSI_14 < 50 and overbought RSI_14 > 50, so the
+        # direction follows from the masks without re-testing RSI_14
         return {
-            'is_reversal': bool(is_reversal),
-            'confidence': float(confidence),
+            'is_reversal': is_reversal,
+            'confidence': confidence,
             'probabilities': {
-                'no_reversal': float(1 - confidence if is_reversal else confidence),
-                'reversal_up': float(confidence / 2 if is_reversal and rsi_14 < 50 else 0.2),
-                'reversal_down': float(confidence / 2 if is_reversal and rsi_14 > 50 else 0.2)
+                'no_reversal': 1 - confidence if is_reversal else confidence,
+                'reversal_up': confidence / 2 if oversold else 0.2,
+                'reversal_down': confidence / 2 if overbought else 0.2
+            }
+        }
+
+    def predict_batch(self, features):
+        """
+        Vectorized predict over many feature rows at once
+
+        Args:
+            features: (N, 21) array of technical indicators
+
+        Returns:
+            dict of length-N arrays, keyed like predict()
+        """
+        features = np.asarray(features, dtype=float)
+        if features.ndim != 2 or features.shape[1] != self.feature_count:
+            raise ValueError(f"Expected an (N, {self.feature_count}) feature batch, got shape {features.shape}")
+
+        rsi_14 = features[:, 0]
+        rsi_7 = features[:, 1]
+
+        oversold = (rsi_14 < 35) & (rsi_7 < 30)
+        overbought = (rsi_14 > 65) & (rsi_7 > 70)
+        is_reversal = oversold | overbought
+
+        confidence = np.where(oversold, 0.75 + (30 - rsi_7) / 100,
+                              np.where(overbought, 0.75 + (rsi_7 - 70) / 100, 0.5))
+        confidence = np.minimum(confidence, 0.95)
+
+        return {
+            'is_reversal': is_reversal,
+            'confidence': confidence,
+            'probabilities': {
+                'no_reversal': np.where(is_reversal, 1 - confidence, confidence),
+                'reversal_up': np.where(oversold, confidence / 2, 0.2),
+                'reversal_down': np.where(overbought, confidence / 2, 0.2)
             }
         }
 
@@ -81,18 +152,40 @@ def predict(self, features):
 # Initialize model
 ml_model = MockMLModel()
 
+# Per-thread feature buffer, refilled on each request instead of allocating
+# a new array (gunicorn gthread serves requests on a fixed set of threads)
+_tls = threading.local()
+
+
+def _feature_buffer():
+    """This thread's reusable float64 array of feature_count values"""
+    buf = getattr(_tls, 'features', None)
+    if buf is None:
+        buf = _tls.features = np.empty(ml_model.feature_count, dtype=float)
+    return buf
+
+
+# Static part of the health payload; the serialized body is rebuilt at most
+# once per second, when iso_now() moves on
+_HEALTH = {
+    'status': 'healthy',
+    'service': 'AlgoTrendy ML Prediction Service',
+    'version': '1.0.0'
+}
+_health_cache = ('', b'')
+
 
 @app.route('/health', methods=['GET'])
 def health():
     """
     Health check endpoint
     """
-    return jsonify({
-        'status': 'healthy',
-        'service': 'AlgoTrendy ML Prediction Service',
-        'version': '1.0.0',
-        'timestamp': datetime.utcnow().isoformat()
-    }), 200
+    global _health_cache
+    timestamp = iso_now()
+    cached = _health_cache
+    if cached[0] != timestamp:
+        cached = _health_cache = (timestamp, orjson.dumps({**_HEALTH, 'timestamp': timestamp}))
+    return app.response_class(cached[1], mimetype='application/json')
 
 
 @app.route('/predict/reversal', methods=['POST'])
@@ -124,91 +217,143 @@ def predict_reversal():
             logger.warning("Missing 'features' in request body")
             return jsonify({
                 'error': "Missing 'features' in request body",
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': iso_now()
             }), 400
 
         features = data['features']
 
         if not isinstance(features, list):
-            logger.warning(f"Invalid features type: {type(features)}")
+            logger.warning("Invalid features type: %s", type(features))
             return jsonify({
                 'error': "Features must be an array",
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': iso_now()
             }), 400
 
         if len(features) != 21:
-            logger.warning(f"Invalid feature count: {len(features)}")
+            logger.warning("Invalid feature count: %d", len(features))
             return jsonify({
                 'error': f"Expected 21 features, got {len(features)}",
-                'timestamp': datetime.utcnow().isoformat()
+                'timestamp': iso_now()
             }), 400
 
-        # Convert to numpy array
-        features_array = np.array(features, dtype=float)
+        # Copy into this thread's feature buffer
+        features_array = _feature_buffer()
+        features_array[:] = features
 
         # Log request
-        logger.info(f"Predicting reversal with features: RSI_14={features_array[0]:.2f}, "
-                   f"RSI_7={features_array[1]:.2f}, MACD={features_array[4]:.2f}")
+        logger.info("Predicting reversal with features: RSI_14=%.2f, RSI_7=%.2f, MACD=%.2f",
+                    features_array[0], features_array[1], features_array[4])
 
         # Make prediction
         prediction = ml_model.predict(features_array)
         prediction['timestamp'] = datetime.utcnow().isoformat()
 
         # Log response
-        logger.info(f"Prediction: is_reversal={prediction['is_reversal']}, "
-                   f"confidence={prediction['confidence']:.3f}")
+        logger.info("Prediction: is_reversal=%s, confidence=%.3f",
+                    prediction['is_reversal'], prediction['confidence'])
 
         return jsonify(prediction), 200
 
     except ValueError as e:
-        logger.error(f"Validation error: {e}")
+        logger.error("Validation error: %s", e)
+        return jsonify({
+            'error': str(e),
+            'timestamp': iso_now()
+        }), 400
+    except Exception as e:
+        logger.error("Prediction error: %s", e, exc_info=True)
+        return jsonify({
+            'error': 'Internal server error',
+            'details': str(e),
+            'timestamp': iso_now()
+        }), 500
+
+
+@app.route('/predict/reversal/batch', methods=['POST'])
+def predict_reversal_batch():
+    """
+    Predict potential price reversals for many feature rows in one request
+
+    Request body:
+    {
+        "batch": [[21 technical indicator values], ...]
+    }
+
+    Response: the /predict/reversal fields, each holding a list with one
+    value per row (probabilities holds one list per class)
+    """
+    try:
+        data = request.get_json()
+
+        if not data or 'batch' not in data:
+            logger.warning("Missing 'batch' in request body")
+            return jsonify({
+                'error': "Missing 'batch' in request body",
+                'timestamp': iso_now()
+            }), 400
+
+        batch = np.asarray(data['batch'], dtype=float)
+        logger.info("Predicting reversal for a batch of %d rows", len(batch))
+
+        # One vectorized call; orjson serializes the result arrays directly
+        predictions = ml_model.predict_batch(batch)
+        predictions['timestamp'] = datetime.utcnow().isoformat()
+
+        return jsonify(predictions), 200
+
+    except ValueError as e:
+        logger.error("Validation error: %s", e)
         return jsonify({
             'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': iso_now()
         }), 400
     except Exception as e:
-        logger.error(f"Prediction error: {e}", exc_info=True)
+        logger.error("Prediction error: %s", e, exc_info=True)
         return jsonify({
             'error': 'Internal server error',
             'details': str(e),
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': iso_now()
         }), 500
 
 
+# The model info never changes at runtime, so it is serialized once
+_MODEL_INFO_BYTES = orjson.dumps({
+    'model_type': 'Mock ML Model (for testing)',
+    'feature_count': ml_model.feature_count,
+    'features': [
+        'RSI_14', 'RSI_7', 'RSI_21', 'RSI_28',
+        'MACD_Value', 'MACD_Signal', 'MACD_Histogram',
+        'BB_Upper', 'BB_Middle', 'BB_Lower',
+        'ATR',
+        'Stochastic_K', 'Stochastic_D',
+        'SMA_20', 'EMA_20',
+        'Volume_Ratio',
+        'ROC',
+        'MFI',
+        'CCI',
+        'Williams_R',
+        'Price_Position'
+    ],
+    'version': '1.0.0',
+    'status': 'active'
+})
+
+
 @app.route('/model/info', methods=['GET'])
 def model_info():
     """
     Get information about the ML model
     """
-    return jsonify({
-        'model_type': 'Mock ML Model (for testing)',
-        'feature_count': ml_model.feature_count,
-        'features': [
-            'RSI_14', 'RSI_7', 'RSI_21', 'RSI_28',
-            'MACD_Value', 'MACD_Signal', 'MACD_Histogram',
-            'BB_Upper', 'BB_Middle', 'BB_Lower',
-            'ATR',
-            'Stochastic_K', 'Stochastic_D',
-            'SMA_20', 'EMA_20',
-            'Volume_Ratio',
-            'ROC',
-            'MFI',
-            'CCI',
-            'Williams_R',
-            'Price_Position'
-        ],
-        'version': '1.0.0',
-        'status': 'active'
-    }), 200
+    return app.response_class(_MODEL_INFO_BYTES, mimetype='application/json')
 
 
 if __name__ == '__main__':
     logger.info("=" * 60)
     logger.info("Starting AlgoTrendy ML Prediction Service")
     logger.info("=" * 60)
-    logger.info(f"Model type: {ml_model.__class__.__name__}")
-    logger.info(f"Expected features: {ml_model.feature_count}")
-    logger.info(f"Listening on: http://0.0.0.0:5003")
+    logger.info("Model type: %s", ml_model.__class__.__name__)
+    logger.info("Expected features: %d", ml_model.feature_count)
+    logger.info("Listening on: http://0.0.0.0:5003")
     logger.info("=" * 60)
 
     app.run(
@@ -12,10 +12,152 @@
 import numpy as np
 from pathlib import Path
 from datetime import datetime
-from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score, confusion_matrix
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback when numba is not installed: run kernels as plain Python"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# Price/volume columns coerced to float32 numbers on load
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Non-reversal rows kept per reversal row when subsampling for training
+NEGATIVES_PER_REVERSAL = 3
+
+# Bars on each side of a candidate reversal
+REVERSAL_WINDOW = 5
+
+
+@njit(cache=True, nogil=True)
+def _reversal_kernel(close, threshold, window, out):
+    """
+    Flag peaks and troughs in one symbol's closes, writing 1/0 into out.
+    A bar needs a full window of closes on both sides to qualify.
+    """
+    n = len(close)
+    up = 1.0 + threshold
+    down = 1.0 - threshold
+    for i in range(n):
+        out[i] = 0
+    for i in range(window, n - window):
+        prev_min = prev_max = close[i - 1]
+        next_min = next_max = close[i + 1]
+        for k in range(2, window + 1):
+            p = close[i - k]
+            q = close[i + k]
+            if p < prev_min:
+                prev_min = p
+            elif p > prev_max:
+                prev_max = p
+            if q < next_min:
+                next_min = q
+            elif q > next_max:
+                next_max = q
+
+        current = close[i]
+        # Peak: current > previous window AND current > next window
+        peak = current > prev_min * up and current > next_min * up
+        # Trough: current < previous window AND current < next window
+        trough = current < prev_max * down and current < next_max * down
+        if peak or trough:
+            out[i] = 1
+
+
+@njit(cache=True, nogil=True)
+def _rolling_mean_std(x, window):
+    """
+    Rolling mean and sample std (ddof=1) of x in a single pass, NaN until
+    the first full window (matches pandas rolling(window).mean()/.std()).
+    Accumulates in float64 and returns arrays of x's dtype.
+    """
+    n = len(x)
+    mean = np.empty_like(x)
+    std = np.empty_like(x)
+    mean[:window - 1] = np.nan
+    std[:window - 1] = np.nan
+    avg = 0.0
+    m2 = 0.0
+    # Length of the current run of equal values; like pandas, a window that
+    # is one value repeated reports that value and a std of exactly 0, so a
+    # flat stretch never carries add/evict rounding residue
+    run = 0
+    prev = np.nan
+    for i in range(n):
+        v = x[i]
+        if v == prev:
+            run += 1
+        else:
+            run = 1
+            prev = v
+        if i < window:
+            # Welford update while the window fills
+            d = v - avg
+            avg += d / (i + 1)
+            m2 += d * (v - avg)
+        elif (i + 1) % window == 0:
+            # Re-derive the moments from the window once per window length
+            # so rounding error from the swap updates cannot accumulate
+            total = 0.0
+            for j in range(i - window + 1, i + 1):
+                total += x[j]
+            avg = total / window
+            m2 = 0.0
+            for j in range(i - window + 1, i + 1):
+                m2 += (x[j] - avg) ** 2
+        else:
+            # Swap the oldest value for v at a fixed count
+            old = x[i - window]
+            new_avg = avg + (v - old) / window
+            m2 += (v - old) * (v - new_avg + old - avg)
+            avg = new_avg
+        if i >= window - 1:
+            if run >= window:
+                mean[i] = v
+                std[i] = 0.0
+            else:
+                mean[i] = avg
+                std[i] = np.sqrt(max(m2, 0.0) / (window - 1))
+    return mean, std
+
+
+@njit(cache=True, nogil=True)
+def _macd_kernel(close, fast, slow, signal):
+    """
+    MACD line and signal line in one forward sweep. EMAs use the adjusted
+    weighting of pandas ewm(span=...).mean(), so values match from bar 0.
+    """
+    n = len(close)
+    macd = np.empty_like(close)
+    macd_signal = np.empty_like(close)
+    decay_fast = 1.0 - 2.0 / (fast + 1)
+    decay_slow = 1.0 - 2.0 / (slow + 1)
+    decay_signal = 1.0 - 2.0 / (signal + 1)
+    num_fast = num_slow = num_signal = 0.0
+    den_fast = den_slow = den_signal = 0.0
+    for i in range(n):
+        num_fast = close[i] + decay_fast * num_fast
+        den_fast = 1.0 + decay_fast * den_fast
+        num_slow = close[i] + decay_slow * num_slow
+        den_slow = 1.0 + decay_slow * den_slow
+        line = num_fast / den_fast - num_slow / den_slow
+        macd[i] = line
+
+        num_signal = line + decay_signal * num_signal
+        den_signal = 1.0 + decay_signal * den_signal
+        macd_signal[i] = num_signal / den_signal
+    return macd, macd_signal
+
+
 class ModelRetrainer:
     """Retrain the trend reversal model with fresh data"""
     
@@ -30,9 +172,9 @@ def __init__(self, data_dir="/root/algotrendy_v2.5/real_market_data",
         self.scaler = None
         
     def load_data(self):
-        """Load all CSV files into one DataFrame"""
+        """Load each symbol's latest CSV, engineer its features and combine"""
         print("\n" + "="*60)
-        print("📂 LOADING DATA")
+        print("📂 LOADING DATA & ENGINEERING FEATURES")
         print("="*60)
         
         dfs = []
@@ -45,10 +187,13 @@ def load_data(self):
                 continue
             
             latest_file = files[-1]
-            df = pd.read_csv(latest_file)
+            df = self._cached_read(latest_file)
             df['symbol'] = symbol
-            dfs.append(df)
             print(f"✅ Loaded {len(df)} rows from {latest_file.name}")
+            
+            # Features are built on each symbol's own series, so rolling
+            # windows and EMAs never carry over from one symbol into the next
+            dfs.append(self._engineer_symbol(df))
         
         if not dfs:
             print("❌ No data files found!")
@@ -58,57 +203,73 @@ def load_data(self):
         print(f"\n📊 Total rows: {len(combined_df)}")
         return combined_df
     
-    def engineer_features(self, df):
-        """Create technical indicators and features"""
-        print("\n" + "="*60)
-        print("🔧 ENGINEERING FEATURES")
-        print("="*60)
-        
-        df = df.copy()
+    def _cached_read(self, path):
+        """
+        Read an OHLCV CSV with numeric columns coerced, through a Parquet copy
+        in data_dir/.cache keyed on the file's mtime. Unchanged files skip CSV
+        parsing and coercion; an edited file gets a fresh cache entry.
+        """
+        cache_dir = self.data_dir / ".cache"
+        cache_path = cache_dir / f"{path.stem}.{path.stat().st_mtime_ns}.parquet"
+        if cache_path.exists():
+            return pd.read_parquet(cache_path, engine="pyarrow")
+        
+        df = pd.read_csv(path)
         
         # Convert types
-        df['open'] = pd.to_numeric(df['open'], errors='coerce')
-        df['high'] = pd.to_numeric(df['high'], errors='coerce')
-        df['low'] = pd.to_numeric(df['low'], errors='coerce')
-        df['close'] = pd.to_numeric(df['close'], errors='coerce')
-        df['volume'] = pd.to_numeric(df['volume'], errors='coerce')
+        for col in OHLCV_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(np.float32)
         
-        # Drop rows with NaN
+        try:
+            cache_dir.mkdir(exist_ok=True)
+            for stale in cache_dir.glob(f"{path.stem}.*.parquet"):
+                stale.unlink()
+            df.to_parquet(cache_path, engine="pyarrow", index=False)
+        except OSError as e:
+            print(f"⚠️  Could not cache {path.name}: {e}")
+        
+        return df
+    
+    def _engineer_symbol(self, df):
+        """Create technical indicators and features for one symbol's rows"""
+        # Drop rows with NaN (the indicator kernels need gap-free input);
+        # this also gives a fresh frame, so no defensive copy is needed
         initial_rows = len(df)
         df = df.dropna()
-        print(f"✅ Cleaned data: {initial_rows} → {len(df)} rows")
-        
-        # Technical indicators
-        print("🔍 Computing indicators...")
         
-        # Simple Moving Averages
-        df['sma_5'] = df['close'].rolling(5).mean()
-        df['sma_20'] = df['close'].rolling(20).mean()
-        df['sma_50'] = df['close'].rolling(50).mean()
-        
-        # RSI
-        delta = df['close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(14).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
-        rs = gain / loss
-        df['rsi'] = 100 - (100 / (1 + rs))
+        # Indicators are float32 like the OHLCV columns they derive from
+        close = df['close'].to_numpy(dtype=np.float32)
+        volume = df['volume'].to_numpy(dtype=np.float32)
+        
+        # Simple Moving Averages (the 20-bar one doubles as the Bollinger mid)
+        sma_5, _ = _rolling_mean_std(close, 5)
+        sma_20, std_20 = _rolling_mean_std(close, 20)
+        sma_50, _ = _rolling_mean_std(close, 50)
+        df['sma_5'] = sma_5
+        df['sma_20'] = sma_20
+        df['sma_50'] = sma_50
+        
+        # RSI (the first bar has no delta and counts as neither gain nor loss)
+        delta = np.diff(close, prepend=close[:1])
+        gain, _ = _rolling_mean_std(np.where(delta > 0, delta, 0.0), 14)
+        loss, _ = _rolling_mean_std(np.where(delta < 0, -delta, 0.0), 14)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            df['rsi'] = 100 - 100 / (1 + gain / loss)
         
         # MACD
-        ema_12 = df['close'].ewm(span=12).mean()
-        ema_26 = df['close'].ewm(span=26).mean()
-        df['macd'] = ema_12 - ema_26
-        df['macd_signal'] = df['macd'].ewm(span=9).mean()
-        df['macd_hist'] = df['macd'] - df['macd_signal']
+        macd, macd_signal = _macd_kernel(close, 12, 26, 9)
+        df['macd'] = macd
+        df['macd_signal'] = macd_signal
+        df['macd_hist'] = macd - macd_signal
         
         # Bollinger Bands
-        bb_mid = df['close'].rolling(20).mean()
-        bb_std = df['close'].rolling(20).std()
-        df['bb_upper'] = bb_mid + (bb_std * 2)
-        df['bb_lower'] = bb_mid - (bb_std * 2)
+        df['bb_upper'] = sma_20 + std_20 * 2
+        df['bb_lower'] = sma_20 - std_20 * 2
         df['bb_position'] = (df['close'] - df['bb_lower']) / (df['bb_upper'] - df['bb_lower'])
         
         # Volume features
-        df['volume_sma'] = df['volume'].rolling(20).mean()
+        volume_sma, _ = _rolling_mean_std(volume, 20)
+        df['volume_sma'] = volume_sma
         df['volume_ratio'] = df['volume'] / df['volume_sma']
         
         # Price features
@@ -117,8 +278,9 @@ def engineer_features(self, df):
         df['oc_range'] = abs(df['close'] - df['open']) / (df['high'] - df['low'])
         
         # Drop initial NaN rows from indicators
-        df = df.dropna()
-        print(f"✅ After indicators: {len(df)} rows")
+        cleaned_rows = len(df)
+        df.dropna(inplace=True)
+        print(f"   🔧 Features: {initial_rows} → {cleaned_rows} clean → {len(df)} rows after indicators")
         
         return df
     
@@ -128,33 +290,14 @@ def detect_reversals(self, df, threshold=0.02):
         print("🔄 DETECTING REVERSALS")
         print("="*60)
         
-        df = df.copy()
-        df['reversal'] = 0
-        
-        for symbol in df['symbol'].unique():
-            mask = df['symbol'] == symbol
-            symbol_df = df[mask].copy()
-            symbol_indices = df[mask].index
-            
-            # Find local peaks (price went up then down)
-            for i in range(5, len(symbol_df) - 5):
-                current = symbol_df['close'].iloc[i]
-                prev_5 = symbol_df['close'].iloc[i-5:i].min()
-                next_5 = symbol_df['close'].iloc[i+1:i+6].min()
-                
-                # Peak: current > previous window AND current > next window
-                if current > prev_5 * (1 + threshold) and current > next_5 * (1 + threshold):
-                    df.loc[symbol_indices[i], 'reversal'] = 1
-            
-            # Find local troughs (price went down then up)
-            for i in range(5, len(symbol_df) - 5):
-                current = symbol_df['close'].iloc[i]
-                prev_5 = symbol_df['close'].iloc[i-5:i].max()
-                next_5 = symbol_df['close'].iloc[i+1:i+6].max()
-                
-                # Trough: current < previous window AND current < next window
-                if current < prev_5 * (1 - threshold) and current < next_5 * (1 - threshold):
-                    df.loc[symbol_indices[i], 'reversal'] = 1
+        # Scan each symbol's closes separately so windows never straddle two symbols
+        close = df['close'].to_numpy()
+        reversal = np.zeros(len(df), dtype=np.int8)
+        for symbol, idx in df.groupby('symbol').indices.items():
+            out = np.empty(len(idx), dtype=np.int8)
+            _reversal_kernel(close[idx], threshold, REVERSAL_WINDOW, out)
+            reversal[idx] = out
+        df['reversal'] = reversal
         
         reversal_count = df['reversal'].sum()
         reversal_pct = (reversal_count / len(df)) * 100
@@ -173,15 +316,13 @@ def prepare_training_data(self, df):
             'bb_position', 'volume_ratio', 'hl_range', 'close_position', 'oc_range'
         ]
         
-        # Remove rows with any NaN in features
-        df_clean = df[feature_cols + ['reversal']].dropna()
-        
-        X = df_clean[feature_cols].values
-        y = df_clean['reversal'].values
+        # NaN rows were already dropped in _engineer_symbol
+        X = df[feature_cols].to_numpy(dtype=np.float32)
+        y = df['reversal'].to_numpy()
         
-        # Replace inf and -inf with 0 or large finite values
-        X = np.where(np.isinf(X), 0, X)
-        X = np.nan_to_num(X, nan=0, posinf=1e6, neginf=-1e6)
+        # Replace NaN, inf and -inf with 0 in one in-place pass (the same
+        # values ml_api_server substitutes at inference time)
+        np.nan_to_num(X, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
         
         print(f"✅ Feature matrix shape: {X.shape}")
         print(f"✅ Target shape: {y.shape}")
@@ -190,32 +331,37 @@ def prepare_training_data(self, df):
         return X, y, feature_cols
     
     def train_model(self, X, y):
-        """Train Gradient Boosting model"""
+        """Train Histogram Gradient Boosting model"""
         print("\n" + "="*60)
         print("🤖 TRAINING MODEL")
         print("="*60)
         
-        # Scale features
-        self.scaler = StandardScaler()
-        X_scaled = self.scaler.fit_transform(X)
+        # Histogram trees are scale-invariant, so the saved scaler is a
+        # pass-through kept for consumers that call scaler.transform()
+        self.scaler = StandardScaler(with_mean=False, with_std=False).fit(X)
         
-        # Train model
-        print("Training Gradient Boosting Classifier...")
-        self.model = GradientBoostingClassifier(
-            n_estimators=200,
+        # Train model (features are binned once; split finding is OpenMP-parallel)
+        print("Training Histogram Gradient Boosting Classifier...")
+        self.model = HistGradientBoostingClassifier(
+            max_iter=200,
             max_depth=7,
             learning_rate=0.1,
-            subsample=0.8,
-            min_samples_split=5,
-            min_samples_leaf=2,
+            l2_regularization=0.0,
+            max_bins=255,
+            early_stopping=True,
+            validation_fraction=0.1,
             random_state=42,
             verbose=0
         )
         
-        self.model.fit(X_scaled, y)
+        # Reversals are rare, so fit on all of them plus a random subset
+        # of the rest instead of the full, mostly negative set
+        sel = self._balanced_sample(y)
+        print(f"Fitting on {len(sel)} of {len(y)} rows (≤{NEGATIVES_PER_REVERSAL}:1 negatives per reversal)")
+        self.model.fit(X[sel], y[sel])
         
-        # Evaluate
-        y_pred = self.model.predict(X_scaled)
+        # Evaluate on every row, at the real class balance
+        y_pred = self.model.predict(X)
         accuracy = accuracy_score(y, y_pred)
         precision = precision_score(y, y_pred, zero_division=0)
         recall = recall_score(y, y_pred, zero_division=0)
@@ -234,6 +380,19 @@ def train_model(self, X, y):
             'f1': f1
         }
     
+    def _balanced_sample(self, y, seed=42):
+        """Row indices of every reversal plus up to NEGATIVES_PER_REVERSAL random non-reversals each"""
+        pos_idx = np.flatnonzero(y == 1)
+        neg_idx = np.flatnonzero(y == 0)
+        if len(pos_idx) == 0:
+            return np.arange(len(y))
+        
+        rng = np.random.default_rng(seed)
+        neg_sample = rng.choice(neg_idx, size=min(len(neg_idx), NEGATIVES_PER_REVERSAL * len(pos_idx)), replace=False)
+        sel = np.concatenate([pos_idx, neg_sample])
+        rng.shuffle(sel)
+        return sel
+    
     def save_model(self, metrics):
         """Save model and scaler"""
         print("\n" + "="*60)
@@ -266,14 +425,11 @@ def run(self):
         print("█ 🤖 TREND REVERSAL MODEL RETRAINING")
         print("█"*60)
         
-        # Load data
+        # Load data and engineer features
         df = self.load_data()
         if df is None:
             return False
         
-        # Engineer features
-        df = self.engineer_features(df)
-        
         # Detect reversals
         df = self.detect_reversals(df)
         